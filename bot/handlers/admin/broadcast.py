@@ -16,7 +16,7 @@ from bot.keyboards.inline.admin_keyboards import (
     get_back_to_admin_panel_keyboard,
     get_admin_panel_keyboard,
 )
-from bot.middlewares.i18n import JsonI18n
+from bot.middlewares.i18n import JsonI18n, I18nContext
 
 router = Router(name="admin_broadcast_router")
 
@@ -24,12 +24,11 @@ router = Router(name="admin_broadcast_router")
 async def broadcast_message_prompt_handler(
     callback: types.CallbackQuery,
     state: FSMContext,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     settings: Settings,
-    session: AsyncSession,
 ):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n:
         logging.error("i18n missing in broadcast_message_prompt_handler")
         await callback.answer("Language service error.", show_alert=True)
@@ -60,12 +59,11 @@ async def broadcast_message_prompt_handler(
 async def process_broadcast_message_handler(
     message: types.Message,
     state: FSMContext,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     settings: Settings,
-    session: AsyncSession,
 ):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n:
         logging.error("i18n missing in process_broadcast_message_handler")
         await message.reply("Language service error.")
@@ -99,11 +97,10 @@ async def cancel_broadcast_at_prompt_stage(
     callback: types.CallbackQuery,
     state: FSMContext,
     settings: Settings,
-    i18n_data: dict,
-    session: AsyncSession,
+    i18n_data: I18nContext,
 ):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not callback.message:
         await callback.answer("Error cancelling.", show_alert=True)
         return
@@ -132,19 +129,19 @@ async def cancel_broadcast_at_prompt_stage(
 async def confirm_broadcast_callback_handler(
     callback: types.CallbackQuery,
     state: FSMContext,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     bot: Bot,
     settings: Settings,
     session: AsyncSession,
 ):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not callback.message:
         await callback.answer("Error processing broadcast confirmation.", show_alert=True)
         return
     _ = lambda key, **kwargs: i18n.gettext(current_lang, key, **kwargs)
 
-    action = callback.data.split(":")[1]
+    action = callback.data.partition(":")[2]
     user_fsm_data = await state.get_data()
 
     if action == "send":
@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.settings import Settings
 from bot.keyboards.inline.admin_keyboards import get_admin_panel_keyboard
-from bot.middlewares.i18n import JsonI18n
+from bot.middlewares.i18n import JsonI18n, I18nContext
 from bot.services.panel_api_service import PanelApiService
 from bot.services.subscription_service import SubscriptionService
 
@@ -26,10 +26,10 @@ async def admin_panel_command_handler(
     message: types.Message,
     state: FSMContext,
     settings: Settings,
-    i18n_data: dict,
+    i18n_data: I18nContext,
 ):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n:
         logging.error("i18n missing in admin_panel_command_handler")
         await message.answer("Language service error.")
@@ -45,13 +45,13 @@ async def admin_panel_command_handler(
 @router.callback_query(F.data.startswith("admin_action:"))
 async def admin_panel_actions_callback_handler(
         callback: types.CallbackQuery, state: FSMContext, settings: Settings,
-        i18n_data: dict, bot: Bot, panel_service: PanelApiService,
+        i18n_data: I18nContext, bot: Bot, panel_service: PanelApiService,
         subscription_service: SubscriptionService, session: AsyncSession):
     action_parts = callback.data.split(":")
     action = action_parts[1]
 
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n:
         logging.error("i18n missing in admin_panel_actions_callback_handler")
         await callback.answer("Language error.", show_alert=True)
@@ -71,10 +71,10 @@ async def admin_panel_actions_callback_handler(
             callback, i18n_data, settings, session)
     elif action == "broadcast":
         await admin_broadcast_handlers.broadcast_message_prompt_handler(
-            callback, state, i18n_data, settings, session)
+            callback, state, i18n_data, settings)
     elif action == "create_promo":
         await admin_promo_handlers.create_promo_prompt_handler(
-            callback, state, i18n_data, settings, session)
+            callback, state, i18n_data, settings)
     elif action == "manage_promos":
         await admin_promo_handlers.manage_promo_codes_handler(
             callback, i18n_data, settings, session)
@@ -83,17 +83,17 @@ async def admin_panel_actions_callback_handler(
             callback, i18n_data, settings, session)
     elif action == "ban_user_prompt":
         await admin_user_mgmnt_handlers.ban_user_prompt_handler(
-            callback, state, i18n_data, settings, session)
+            callback, state, i18n_data, settings)
     elif action == "unban_user_prompt":
         await admin_user_mgmnt_handlers.unban_user_prompt_handler(
-            callback, state, i18n_data, settings, session)
+            callback, state, i18n_data, settings)
     elif action == "view_banned":
 
         await admin_user_mgmnt_handlers.view_banned_users_handler(
             callback, state, i18n_data, settings, session)
     elif action == "view_logs_menu":
         await admin_logs_handlers.display_logs_menu(callback, i18n_data,
-                                                    settings, session)
+                                                    settings)
     elif action == "sync_panel":
 
         await admin_sync_handlers.sync_command_handler(
@@ -102,6 +102,7 @@ async def admin_panel_actions_callback_handler(
             settings=settings,
             i18n_data=i18n_data,
             panel_service=panel_service,
+            subscription_service=subscription_service,
             session=session)
         await callback.answer(_("admin_sync_initiated_from_panel"))
     elif action == "main":
@@ -125,11 +126,11 @@ async def admin_panel_actions_callback_handler(
 @router.callback_query(F.data.startswith("admin_extend:"))
 async def admin_extend_subscription_handler(
         callback: types.CallbackQuery, settings: Settings,
-        i18n_data: dict, bot: Bot, subscription_service: SubscriptionService,
+        i18n_data: I18nContext, bot: Bot, subscription_service: SubscriptionService,
         session: AsyncSession):
     
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     _ = lambda key, **kwargs: i18n.gettext(current_lang, key, **kwargs) if i18n else key
     
     try:
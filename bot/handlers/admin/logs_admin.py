@@ -16,16 +16,16 @@ from bot.states.admin_states import AdminStates
 from bot.keyboards.inline.admin_keyboards import (
     get_logs_menu_keyboard, get_logs_pagination_keyboard,
     get_back_to_admin_panel_keyboard)
-from bot.middlewares.i18n import JsonI18n
+from bot.middlewares.i18n import JsonI18n, I18nContext
 
 router = Router(name="admin_logs_router")
 USERNAME_REGEX = re.compile(r"^[a-zA-Z0-9_]{5,32}$")
 
 
-async def display_logs_menu(callback: types.CallbackQuery, i18n_data: dict,
-                            settings: Settings, session: AsyncSession):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+async def display_logs_menu(callback: types.CallbackQuery, i18n_data: I18nContext,
+                            settings: Settings):
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
 
     if not i18n or not callback.message:
         await callback.answer("Error displaying logs menu.", show_alert=True)
@@ -152,7 +152,7 @@ async def _display_formatted_logs(target_message: types.Message,
 
 @router.callback_query(F.data.startswith("admin_logs:view_all"))
 async def view_all_logs_handler(callback: types.CallbackQuery,
-                                settings: Settings, i18n_data: dict,
+                                settings: Settings, i18n_data: I18nContext,
                                 session: AsyncSession):
     page_idx = 0
     parts = callback.data.split(":")
@@ -162,8 +162,8 @@ async def view_all_logs_handler(callback: types.CallbackQuery,
         except ValueError:
             page_idx = 0
 
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
+    i18n: Optional[JsonI18n] = i18n_data.i18n
+    current_lang = i18n_data.lang
     if not i18n or not callback.message:
         await callback.answer("Error processing request.", show_alert=True)
         return
@@ -187,11 +187,10 @@ async def view_all_logs_handler(callback: types.CallbackQuery,
 
 @router.callback_query(F.data == "admin_logs:prompt_user")
 async def prompt_user_for_logs_handler(callback: types.CallbackQuery,
-                                       state: FSMContext, i18n_data: dict,
-                                       settings: Settings,
-                                       session: AsyncSession):
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
+                                       state: FSMContext, i18n_data: I18nContext,
+                                       settings: Settings):
+    i18n: Optional[JsonI18n] = i18n_data.i18n
+    current_lang = i18n_data.lang
     if not i18n or not callback.message:
         await callback.answer("Error preparing user log prompt.",
                               show_alert=True)
@@ -208,12 +207,12 @@ async def prompt_user_for_logs_handler(callback: types.CallbackQuery,
 @router.message(AdminStates.waiting_for_user_id_for_logs, F.text)
 async def process_user_id_for_logs_handler(message: types.Message,
                                            state: FSMContext,
-                                           settings: Settings, i18n_data: dict,
+                                           settings: Settings, i18n_data: I18nContext,
                                            session: AsyncSession):
     await state.clear()
 
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
+    i18n: Optional[JsonI18n] = i18n_data.i18n
+    current_lang = i18n_data.lang
     if not i18n:
         await message.reply("Language service error.")
         return
@@ -264,7 +263,7 @@ async def process_user_id_for_logs_handler(message: types.Message,
 
 @router.callback_query(F.data.startswith("admin_logs:view_user:"))
 async def view_user_logs_paginated_handler(callback: types.CallbackQuery,
-                                           settings: Settings, i18n_data: dict,
+                                           settings: Settings, i18n_data: I18nContext,
                                            session: AsyncSession):
     try:
         parts = callback.data.split(":")
@@ -274,8 +273,8 @@ async def view_user_logs_paginated_handler(callback: types.CallbackQuery,
         await callback.answer("Invalid log request format.", show_alert=True)
         return
 
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
+    i18n: Optional[JsonI18n] = i18n_data.i18n
+    current_lang = i18n_data.lang
     if not i18n or not callback.message:
         await callback.answer("Error processing request.", show_alert=True)
         return
@@ -316,8 +315,8 @@ async def view_user_logs_paginated_handler(callback: types.CallbackQuery,
 async def cancel_log_user_input_state_to_menu(callback: types.CallbackQuery,
                                               state: FSMContext,
                                               settings: Settings,
-                                              i18n_data: dict,
+                                              i18n_data: I18nContext,
                                               session: AsyncSession):
     await state.clear()
 
-    await display_logs_menu(callback, i18n_data, settings, session)
+    await display_logs_menu(callback, i18n_data, settings)
@@ -13,17 +13,16 @@ from db.dal import promo_code_dal
 from bot.states.admin_states import AdminStates
 from bot.keyboards.inline.admin_keyboards import get_back_to_admin_panel_keyboard, get_admin_panel_keyboard
 from aiogram.utils.keyboard import InlineKeyboardBuilder, InlineKeyboardButton
-from bot.middlewares.i18n import JsonI18n
+from bot.middlewares.i18n import JsonI18n, I18nContext
 
 router = Router(name="admin_promo_codes_router")
 
 
 async def create_promo_prompt_handler(callback: types.CallbackQuery,
-                                      state: FSMContext, i18n_data: dict,
-                                      settings: Settings,
-                                      session: AsyncSession):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+                                      state: FSMContext, i18n_data: I18nContext,
+                                      settings: Settings):
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not callback.message:
         await callback.answer("Error preparing promo creation.",
                               show_alert=True)
@@ -50,11 +49,11 @@ async def create_promo_prompt_handler(callback: types.CallbackQuery,
 @router.message(AdminStates.waiting_for_promo_details, F.text)
 async def process_promo_code_details_handler(message: types.Message,
                                              state: FSMContext,
-                                             i18n_data: dict,
+                                             i18n_data: I18nContext,
                                              settings: Settings,
                                              session: AsyncSession):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n:
         await message.reply("Language service error.")
         return
@@ -143,10 +142,10 @@ async def process_promo_code_details_handler(message: types.Message,
 
 
 async def view_promo_codes_handler(callback: types.CallbackQuery,
-                                   i18n_data: dict, settings: Settings,
+                                   i18n_data: I18nContext, settings: Settings,
                                    session: AsyncSession):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not callback.message:
         await callback.answer("Error displaying promo codes.", show_alert=True)
         return
@@ -198,10 +197,10 @@ async def view_promo_codes_handler(callback: types.CallbackQuery,
 
 @router.callback_query(F.data == "admin_action:manage_promos")
 async def manage_promo_codes_handler(callback: types.CallbackQuery,
-                                     i18n_data: dict, settings: Settings,
+                                     i18n_data: I18nContext, settings: Settings,
                                      session: AsyncSession):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not callback.message:
         await callback.answer("Error displaying promo codes.", show_alert=True)
         return
@@ -239,12 +238,12 @@ async def manage_promo_codes_handler(callback: types.CallbackQuery,
 
 @router.callback_query(F.data.startswith("promo_edit:"))
 async def promo_edit_select_handler(callback: types.CallbackQuery, state: FSMContext,
-                                    i18n_data: dict, settings: Settings,
+                                    i18n_data: I18nContext, settings: Settings,
                                     session: AsyncSession):
-    promo_id = int(callback.data.split(":")[1])
+    promo_id = int(callback.data.partition(":")[2])
     promo = await promo_code_dal.get_promo_code_by_id(session, promo_id)
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not promo or not callback.message:
         await callback.answer("Error", show_alert=True)
         return
@@ -261,12 +260,12 @@ async def promo_edit_select_handler(callback: types.CallbackQuery, state: FSMCon
 
 @router.message(AdminStates.waiting_for_promo_edit_details, F.text)
 async def process_promo_edit_details(message: types.Message, state: FSMContext,
-                                     i18n_data: dict, settings: Settings,
+                                     i18n_data: I18nContext, settings: Settings,
                                      session: AsyncSession):
     data = await state.get_data()
     promo_id = data.get("edit_promo_id")
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not promo_id:
         await message.answer("Error")
         await state.clear()
@@ -310,12 +309,12 @@ async def process_promo_edit_details(message: types.Message, state: FSMContext,
 
 
 @router.callback_query(F.data.startswith("promo_delete:"))
-async def promo_delete_handler(callback: types.CallbackQuery, i18n_data: dict,
+async def promo_delete_handler(callback: types.CallbackQuery, i18n_data: I18nContext,
                                settings: Settings, session: AsyncSession):
-    promo_id = int(callback.data.split(":")[1])
+    promo_id = int(callback.data.partition(":")[2])
     promo = await promo_code_dal.delete_promo_code(session, promo_id)
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not callback.message:
         await callback.answer("Error", show_alert=True)
         return
@@ -345,10 +344,9 @@ async def promo_delete_handler(callback: types.CallbackQuery, i18n_data: dict,
 async def cancel_promo_creation_state_to_menu(callback: types.CallbackQuery,
                                               state: FSMContext,
                                               settings: Settings,
-                                              i18n_data: dict,
-                                              session: AsyncSession):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+                                              i18n_data: I18nContext):
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not callback.message:
         await callback.answer("Error cancelling.", show_alert=True)
         return
@@ -10,16 +10,16 @@ from db.dal import user_dal, payment_dal, panel_sync_dal
 from db.models import Payment, PanelSyncStatus
 
 from bot.keyboards.inline.admin_keyboards import get_back_to_admin_panel_keyboard
-from bot.middlewares.i18n import JsonI18n
+from bot.middlewares.i18n import JsonI18n, I18nContext
 
 router = Router(name="admin_statistics_router")
 
 
 async def show_statistics_handler(callback: types.CallbackQuery,
-                                  i18n_data: dict, settings: Settings,
+                                  i18n_data: I18nContext, settings: Settings,
                                   session: AsyncSession):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not callback.message:
         await callback.answer("Error displaying statistics.", show_alert=True)
         return
@@ -7,10 +7,11 @@ from datetime import datetime, timezone
 
 from config.settings import Settings
 from bot.services.panel_api_service import PanelApiService
+from bot.services.subscription_service import SubscriptionService
 
 from db.dal import user_dal, subscription_dal, panel_sync_dal
 
-from bot.middlewares.i18n import JsonI18n
+from bot.middlewares.i18n import JsonI18n, I18nContext
 
 router = Router(name="admin_sync_router")
 
@@ -20,12 +21,13 @@ async def sync_command_handler(
     message_event: Union[types.Message, types.CallbackQuery],
     bot: Bot,
     settings: Settings,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     panel_service: PanelApiService,
+    subscription_service: SubscriptionService,
     session: AsyncSession,
 ):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n:
         logging.error("i18n missing in sync_command_handler")
 
@@ -213,6 +215,9 @@ async def sync_command_handler(
                             session, panel_uuid, panel_sub_link_id
                         )
                         await subscription_dal.upsert_subscription(session, sub_payload)
+                        subscription_service.invalidate_active_subscription_cache(
+                            telegram_id_from_panel
+                        )
                         subscriptions_synced_count += 1
                         users_synced_successfully += 1
                     except ValueError as e_date:
@@ -239,6 +244,9 @@ async def sync_command_handler(
                 await subscription_dal.deactivate_other_active_subscriptions(
                     session, panel_uuid, None
                 )
+                subscription_service.invalidate_active_subscription_cache(
+                    telegram_id_from_panel
+                )
                 logging.info(
                     f"Sync: Panel user {panel_uuid} (TG ID: {telegram_id_from_panel}) has no subscription link on panel. Deactivated local subs if any."
                 )
@@ -256,6 +264,9 @@ async def sync_command_handler(
                 await subscription_dal.deactivate_other_active_subscriptions(
                     session, local_user.panel_user_uuid, None
                 )
+                subscription_service.invalidate_active_subscription_cache(
+                    local_user.user_id
+                )
                 logging.info(
                     f"Sync: Local user {local_user.user_id} with panel UUID {local_user.panel_user_uuid} not found on panel. Deactivated local subs."
                 )
@@ -315,10 +326,10 @@ async def sync_command_handler(
 
 @router.message(Command("syncstatus"))
 async def sync_status_command_handler(
-    message: types.Message, i18n_data: dict, settings: Settings, session: AsyncSession
+    message: types.Message, i18n_data: I18nContext, settings: Settings, session: AsyncSession
 ):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n:
         await message.answer("Language error.")
         return
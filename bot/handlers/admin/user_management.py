@@ -14,13 +14,14 @@ from db.dal import user_dal, subscription_dal
 from db.models import User, Subscription
 
 from bot.services.panel_api_service import PanelApiService
+from bot.services.subscription_service import SubscriptionService
 
 from bot.states.admin_states import AdminStates
 from bot.keyboards.inline.admin_keyboards import (
     get_back_to_admin_panel_keyboard, get_user_card_keyboard,
     get_banned_users_keyboard, get_confirmation_keyboard,
     get_admin_panel_keyboard)
-from bot.middlewares.i18n import JsonI18n
+from bot.middlewares.i18n import JsonI18n, I18nContext
 
 router = Router(name="admin_user_management_router")
 USERNAME_REGEX = re.compile(r"^[a-zA-Z0-9_]{5,32}$")
@@ -41,10 +42,10 @@ async def _get_user_model_by_input(session: AsyncSession,
 
 
 async def ban_user_prompt_handler(callback: types.CallbackQuery,
-                                  state: FSMContext, i18n_data: dict,
-                                  settings: Settings, session: AsyncSession):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+                                  state: FSMContext, i18n_data: I18nContext,
+                                  settings: Settings):
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not callback.message:
         await callback.answer("Error processing ban prompt.", show_alert=True)
         return
@@ -68,12 +69,13 @@ async def ban_user_prompt_handler(callback: types.CallbackQuery,
 
 @router.message(AdminStates.waiting_for_user_id_to_ban, F.text)
 async def process_user_input_to_ban_handler(message: types.Message,
-                                            state: FSMContext, i18n_data: dict,
+                                            state: FSMContext, i18n_data: I18nContext,
                                             settings: Settings,
                                             panel_service: PanelApiService,
+                                            subscription_service: SubscriptionService,
                                             session: AsyncSession):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n:
         await message.reply("Language service error.")
         return
@@ -119,6 +121,8 @@ async def process_user_input_to_ban_handler(message: types.Message,
                 panel_ban_message_part = _("admin_panel_ban_fail_part")
 
         await session.commit()
+        subscription_service.invalidate_active_subscription_cache(
+            user_id_to_ban)
         await message.answer(_("admin_user_banned_success_combined",
                                user_id_or_username=user_display_for_msg,
                                panel_status_part=panel_ban_message_part),
@@ -132,10 +136,10 @@ async def process_user_input_to_ban_handler(message: types.Message,
 
 
 async def unban_user_prompt_handler(callback: types.CallbackQuery,
-                                    state: FSMContext, i18n_data: dict,
-                                    settings: Settings, session: AsyncSession):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+                                    state: FSMContext, i18n_data: I18nContext,
+                                    settings: Settings):
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not callback.message:
         await callback.answer("Error processing unban prompt.",
                               show_alert=True)
@@ -161,12 +165,13 @@ async def unban_user_prompt_handler(callback: types.CallbackQuery,
 @router.message(AdminStates.waiting_for_user_id_to_unban, F.text)
 async def process_user_input_to_unban_handler(message: types.Message,
                                               state: FSMContext,
-                                              i18n_data: dict,
+                                              i18n_data: I18nContext,
                                               settings: Settings,
                                               panel_service: PanelApiService,
+                                              subscription_service: SubscriptionService,
                                               session: AsyncSession):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n:
         await message.reply("Language service error.")
         return
@@ -206,6 +211,8 @@ async def process_user_input_to_unban_handler(message: types.Message,
                 panel_unban_message_part = _("admin_panel_unban_fail_part")
 
         await session.commit()
+        subscription_service.invalidate_active_subscription_cache(
+            user_id_to_unban)
         await message.answer(_("admin_user_unbanned_success_combined",
                                user_id_or_username=user_display_for_msg,
                                panel_status_part=panel_unban_message_part),
@@ -219,18 +226,18 @@ async def process_user_input_to_unban_handler(message: types.Message,
 
 
 async def view_banned_users_handler(callback: types.CallbackQuery,
-                                    state: FSMContext, i18n_data: dict,
+                                    state: FSMContext, i18n_data: I18nContext,
                                     settings: Settings, session: AsyncSession):
     await state.clear()
     current_page_idx = 0
     if ":" in callback.data and callback.data.count(":") == 2:
         try:
-            current_page_idx = int(callback.data.split(":")[-1])
+            current_page_idx = int(callback.data.rpartition(":")[2])
         except ValueError:
             current_page_idx = 0
 
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not callback.message:
         await callback.answer("Error displaying banned users.",
                               show_alert=True)
@@ -264,11 +271,11 @@ async def view_banned_users_handler(callback: types.CallbackQuery,
 async def _show_user_card_actual(target_message: types.Message,
                                  user_id_to_show: int,
                                  banned_list_page_to_return: int,
-                                 i18n_data: dict, settings: Settings,
+                                 i18n_data: I18nContext, settings: Settings,
                                  panel_service: PanelApiService,
                                  session: AsyncSession):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n: return
 
     _ = lambda key, **kwargs: i18n.gettext(current_lang, key, **kwargs)
@@ -314,7 +321,7 @@ async def _show_user_card_actual(target_message: types.Message,
 @router.callback_query(F.data.startswith("admin_user_card:"))
 async def show_user_card_handler(callback: types.CallbackQuery,
                                  state: FSMContext,
-                                 i18n_data: dict,
+                                 i18n_data: I18nContext,
                                  settings: Settings,
                                  panel_service: PanelApiService,
                                  session: AsyncSession,
@@ -337,7 +344,7 @@ async def show_user_card_handler(callback: types.CallbackQuery,
             await callback.answer("Invalid user card data.", show_alert=True)
             return
 
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not callback.message:
         await callback.answer("Error displaying user card.", show_alert=True)
         return
@@ -355,7 +362,7 @@ async def show_user_card_handler(callback: types.CallbackQuery,
 
 
 async def _confirm_action_handler(callback: types.CallbackQuery,
-                                  i18n_data: dict, settings: Settings,
+                                  i18n_data: I18nContext, settings: Settings,
                                   session: AsyncSession, action_type: str):
     try:
 
@@ -366,8 +373,8 @@ async def _confirm_action_handler(callback: types.CallbackQuery,
         await callback.answer("Invalid confirmation data.", show_alert=True)
         return
 
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not callback.message:
         await callback.answer("Error processing confirmation.",
                               show_alert=True)
@@ -396,22 +403,23 @@ async def _confirm_action_handler(callback: types.CallbackQuery,
 
 
 @router.callback_query(F.data.startswith("admin_ban_confirm:"))
-async def confirm_ban_handler(callback: types.CallbackQuery, i18n_data: dict,
+async def confirm_ban_handler(callback: types.CallbackQuery, i18n_data: I18nContext,
                               settings: Settings, session: AsyncSession):
     await _confirm_action_handler(callback, i18n_data, settings, session,
                                   "ban")
 
 
 @router.callback_query(F.data.startswith("admin_unban_confirm:"))
-async def confirm_unban_handler(callback: types.CallbackQuery, i18n_data: dict,
+async def confirm_unban_handler(callback: types.CallbackQuery, i18n_data: I18nContext,
                                 settings: Settings, session: AsyncSession):
     await _confirm_action_handler(callback, i18n_data, settings, session,
                                   "unban")
 
 
 async def _do_ban_unban_action_handler(callback: types.CallbackQuery,
-                                       i18n_data: dict, settings: Settings,
+                                       i18n_data: I18nContext, settings: Settings,
                                        panel_service: PanelApiService,
+                                       subscription_service: SubscriptionService,
                                        session: AsyncSession,
                                        state: FSMContext, action_type: str):
     try:
@@ -423,8 +431,8 @@ async def _do_ban_unban_action_handler(callback: types.CallbackQuery,
         await callback.answer("Invalid action data.", show_alert=True)
         return
 
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not callback.message:
         await callback.answer("Error processing action.", show_alert=True)
         return
@@ -475,6 +483,8 @@ async def _do_ban_unban_action_handler(callback: types.CallbackQuery,
                 )
 
         await session.commit()
+        subscription_service.invalidate_active_subscription_cache(
+            user_id_target)
         alert_message_key = f"admin_user_{action_type}ned_from_card_alert"
         await callback.answer(_(alert_message_key,
                                 user_display=user_display_name,
@@ -498,21 +508,25 @@ async def _do_ban_unban_action_handler(callback: types.CallbackQuery,
 
 
 @router.callback_query(F.data.startswith("admin_ban_do:"))
-async def do_ban_user_handler(callback: types.CallbackQuery, i18n_data: dict,
+async def do_ban_user_handler(callback: types.CallbackQuery, i18n_data: I18nContext,
                               settings: Settings,
                               panel_service: PanelApiService,
+                              subscription_service: SubscriptionService,
                               session: AsyncSession, state: FSMContext):
     await _do_ban_unban_action_handler(callback, i18n_data, settings,
-                                       panel_service, session, state, "ban")
+                                       panel_service, subscription_service,
+                                       session, state, "ban")
 
 
 @router.callback_query(F.data.startswith("admin_unban_do:"))
-async def do_unban_user_handler(callback: types.CallbackQuery, i18n_data: dict,
+async def do_unban_user_handler(callback: types.CallbackQuery, i18n_data: I18nContext,
                                 settings: Settings,
                                 panel_service: PanelApiService,
+                                subscription_service: SubscriptionService,
                                 session: AsyncSession, state: FSMContext):
     await _do_ban_unban_action_handler(callback, i18n_data, settings,
-                                       panel_service, session, state, "unban")
+                                       panel_service, subscription_service,
+                                       session, state, "unban")
 
 
 @router.callback_query(F.data == "admin_action:main",
@@ -523,11 +537,11 @@ async def cancel_user_management_input_state(
     callback: types.CallbackQuery,
     state: FSMContext,
     settings: Settings,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     bot: Bot,
 ):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not callback.message:
         await callback.answer("Error cancelling.", show_alert=True)
         return
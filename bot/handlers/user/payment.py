@@ -1,5 +1,6 @@
 import logging
 import json
+import orjson
 import asyncio
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any
@@ -284,7 +285,7 @@ async def yookassa_webhook_route(request: web.Request):
             text="Internal Server Error: Missing app context component")
 
     try:
-        event_json = await request.json()
+        event_json = await request.json(loads=orjson.loads)
 
         notification_object = WebhookNotification(event_json)
         payment_data_from_notification = notification_object.object
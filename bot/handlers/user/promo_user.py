@@ -1,6 +1,7 @@
 import logging
 import re
 from aiogram import Router, F, types, Bot
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.fsm.context import FSMContext
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -15,7 +16,7 @@ from bot.keyboards.inline.user_keyboards import (
     get_connect_and_main_keyboard,
 )
 from datetime import datetime
-from bot.middlewares.i18n import JsonI18n
+from bot.middlewares.i18n import JsonI18n, I18nContext
 
 from .start import send_main_menu
 
@@ -33,16 +34,15 @@ MAX_PROMO_CODE_INPUT_LENGTH = 100
 async def prompt_promo_code_input(
     callback: types.CallbackQuery,
     state: FSMContext,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     settings: Settings,
-    session: AsyncSession,
 ):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n:
         await callback.answer("Language service error.", show_alert=True)
         return
-    _ = lambda key, **kwargs: i18n.gettext(current_lang, key, **kwargs)
+    _ = i18n_data.get_text
 
     if not callback.message:
         logging.error("CallbackQuery has no message in prompt_promo_code_input")
@@ -54,14 +54,15 @@ async def prompt_promo_code_input(
             text=_(key="promo_code_prompt"),
             reply_markup=get_back_to_main_menu_markup(current_lang, i18n),
         )
-    except Exception as e_edit:
-        logging.warning(
-            f"Failed to edit message for promo prompt: {e_edit}. Sending new one."
-        )
-        await callback.message.answer(
-            text=_(key="promo_code_prompt"),
-            reply_markup=get_back_to_main_menu_markup(current_lang, i18n),
-        )
+    except TelegramBadRequest as e_edit:
+        if "message is not modified" not in e_edit.message:
+            logging.warning(
+                f"Failed to edit message for promo prompt: {e_edit}. Sending new one."
+            )
+            await callback.message.answer(
+                text=_(key="promo_code_prompt"),
+                reply_markup=get_back_to_main_menu_markup(current_lang, i18n),
+            )
 
     await callback.answer()
     await state.set_state(UserPromoStates.waiting_for_promo_code)
@@ -76,7 +77,7 @@ async def process_promo_code_input(
     message: types.Message,
     state: FSMContext,
     settings: Settings,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     promo_code_service: PromoCodeService,
     subscription_service: SubscriptionService,
     bot: Bot,
@@ -86,8 +87,8 @@ async def process_promo_code_input(
         f"Processing promo code input from user {message.from_user.id} in state {await state.get_state()}: '{message.text}'"
     )
 
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
 
     if not i18n or not promo_code_service:
         logging.error(
@@ -97,7 +98,7 @@ async def process_promo_code_input(
         await state.clear()
         return
 
-    _ = lambda key, **kwargs: i18n.gettext(current_lang, key, **kwargs)
+    _ = i18n_data.get_text
     code_input = message.text.strip() if message.text else ""
     user = message.from_user
 
@@ -168,7 +169,7 @@ async def process_promo_code_input(
             active = await subscription_service.get_active_subscription_details(
                 session, user.id
             )
-            config_link = active.get("config_link") if active else None
+            config_link = active.config_link if active else None
             config_link = config_link or _("config_link_not_available")
 
             response_to_user_text = _(
@@ -209,12 +210,11 @@ async def cancel_promo_input_via_button(
     callback: types.CallbackQuery,
     state: FSMContext,
     settings: Settings,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     subscription_service: SubscriptionService,
     session: AsyncSession,
 ):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n:
         logging.error("i18n missing in cancel_promo_input_via_button")
         await callback.answer("Language error", show_alert=True)
@@ -230,5 +230,5 @@ async def cancel_promo_input_via_button(
             callback, settings, i18n_data, subscription_service, session, is_edit=True
         )
     else:
-        _ = lambda key, **kwargs: i18n.gettext(current_lang, key, **kwargs)
+        _ = i18n_data.get_text
         await callback.answer(_("promo_input_cancelled_short"), show_alert=False)
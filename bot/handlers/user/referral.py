@@ -1,25 +1,24 @@
 import logging
 from aiogram import Router, F, types, Bot
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.filters import Command
 from typing import Optional, Union
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.settings import Settings
 from bot.services.referral_service import ReferralService
 
 from bot.keyboards.inline.user_keyboards import get_back_to_main_menu_markup
-from bot.middlewares.i18n import JsonI18n
+from bot.middlewares.i18n import JsonI18n, I18nContext
 
 router = Router(name="user_referral_router")
 
 
 async def referral_command_handler(event: Union[types.Message,
                                                 types.CallbackQuery],
-                                   settings: Settings, i18n_data: dict,
-                                   referral_service: ReferralService, bot: Bot,
-                                   session: AsyncSession):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+                                   settings: Settings, i18n_data: I18nContext,
+                                   referral_service: ReferralService, bot: Bot):
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
 
     target_message_obj = event.message if isinstance(
         event, types.CallbackQuery) else event
@@ -41,7 +40,7 @@ async def referral_command_handler(event: Union[types.Message,
         if isinstance(event, types.CallbackQuery): await event.answer()
         return
 
-    _ = lambda key, **kwargs: i18n.gettext(current_lang, key, **kwargs)
+    _ = i18n_data.get_text
 
     try:
         bot_info = await bot.get_me()
@@ -98,11 +97,12 @@ async def referral_command_handler(event: Union[types.Message,
             await event.message.edit_text(text,
                                           reply_markup=reply_markup_val,
                                           disable_web_page_preview=True)
-        except Exception as e_edit:
-            logging.warning(
-                f"Failed to edit message for referral info: {e_edit}. Sending new one."
-            )
-            await event.message.answer(text,
-                                       reply_markup=reply_markup_val,
-                                       disable_web_page_preview=True)
+        except TelegramBadRequest as e_edit:
+            if "message is not modified" not in e_edit.message:
+                logging.warning(
+                    f"Failed to edit message for referral info: {e_edit}. Sending new one."
+                )
+                await event.message.answer(text,
+                                           reply_markup=reply_markup_val,
+                                           disable_web_page_preview=True)
         await event.answer()
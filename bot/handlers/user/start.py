@@ -1,5 +1,7 @@
 import logging
+from contextlib import suppress
 from aiogram import Router, F, types, Bot
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.utils.text_decorations import html_decoration as hd
 from aiogram.filters import CommandStart, Command
 from aiogram.fsm.context import FSMContext
@@ -18,27 +20,40 @@ from bot.services.panel_api_service import PanelApiService
 from bot.services.referral_service import ReferralService
 from bot.services.promo_code_service import PromoCodeService
 from config.settings import Settings
-from bot.middlewares.i18n import JsonI18n
+from bot.middlewares.i18n import JsonI18n, I18nContext
 
 router = Router(name="user_start_router")
 
 
+def _is_already_rendered(
+    message: types.Message, text: str, reply_markup: types.InlineKeyboardMarkup
+) -> bool:
+    # The callback carries a snapshot of the message being edited, so an
+    # identical re-render can be detected without a Telegram round-trip.
+    return (
+        isinstance(message, types.Message)
+        and message.reply_markup == reply_markup
+        and message.html_text == text
+    )
+
+
 async def send_main_menu(
     target_event: Union[types.Message, types.CallbackQuery],
     settings: Settings,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     subscription_service: SubscriptionService,
     session: AsyncSession,
     is_edit: bool = False,
+    answer_text: Optional[str] = None,
 ):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
 
     user_id = target_event.from_user.id
     user_full_name = hd.quote(target_event.from_user.full_name)
 
     if not i18n:
-        logging.error(f"i18n_instance missing in send_main_menu for user {user_id}")
+        logging.error("i18n_instance missing in send_main_menu for user %s", user_id)
         err_msg_fallback = (
             "Error: Language service unavailable. Please try again later."
         )
@@ -58,7 +73,7 @@ async def send_main_menu(
                 pass
         return
 
-    _ = lambda key, **kwargs: i18n.gettext(current_lang, key, **kwargs)
+    _ = i18n_data.get_text
 
     show_trial_button_in_menu = False
     if settings.TRIAL_ENABLED:
@@ -85,44 +100,61 @@ async def send_main_menu(
     elif isinstance(target_event, types.CallbackQuery) and target_event.message:
         target_message_obj = target_event.message
 
-    if not target_message_obj:
-        logging.error(
-            f"send_main_menu: target_message_obj is None for event from user {user_id}."
-        )
-        if isinstance(target_event, types.CallbackQuery):
-            await target_event.answer(_("error_displaying_menu"), show_alert=True)
-        return
-
+    callback_answer_text: Optional[str] = answer_text
+    callback_show_alert = False
     try:
-        if is_edit:
-            await target_message_obj.edit_text(text, reply_markup=reply_markup)
-        else:
-            await target_message_obj.answer(text, reply_markup=reply_markup)
+        if not target_message_obj:
+            logging.error(
+                "send_main_menu: target_message_obj is None for event from user %s.",
+                user_id,
+            )
+            callback_answer_text = _("error_displaying_menu")
+            callback_show_alert = True
+            return
 
+        try:
+            if is_edit:
+                if _is_already_rendered(target_message_obj, text, reply_markup):
+                    return
+                await target_message_obj.edit_text(text, reply_markup=reply_markup)
+            else:
+                await target_message_obj.answer(text, reply_markup=reply_markup)
+        except TelegramBadRequest as e_send_edit:
+            if is_edit and "message is not modified" in e_send_edit.message:
+                return
+            logging.warning(
+                "Failed to send/edit main menu (user: %s, is_edit: %s): %s - %s.",
+                user_id,
+                is_edit,
+                type(e_send_edit).__name__,
+                e_send_edit,
+            )
+            if (
+                is_edit
+                and target_message_obj
+                and hasattr(target_message_obj, "chat")
+                and target_message_obj.chat
+            ):
+                try:
+                    await target_message_obj.chat.send_message(
+                        text, reply_markup=reply_markup
+                    )
+                except Exception as e_send_new:
+                    logging.error(
+                        "Also failed to send new main menu message for user %s: %s",
+                        user_id,
+                        e_send_new,
+                    )
+            if is_edit:
+                callback_answer_text = _("error_occurred_try_again")
+    finally:
+        # Callers may already have answered the query (e.g. with an alert);
+        # a repeated answer is rejected by Telegram and is safe to ignore.
         if isinstance(target_event, types.CallbackQuery):
-            await target_event.answer()
-    except Exception as e_send_edit:
-        logging.warning(
-            f"Failed to send/edit main menu (user: {user_id}, is_edit: {is_edit}): {type(e_send_edit).__name__} - {e_send_edit}."
-        )
-        if (
-            is_edit
-            and target_message_obj
-            and hasattr(target_message_obj, "chat")
-            and target_message_obj.chat
-        ):
-            try:
-                await target_message_obj.chat.send_message(
-                    text, reply_markup=reply_markup
-                )
-            except Exception as e_send_new:
-                logging.error(
-                    f"Also failed to send new main menu message for user {user_id}: {e_send_new}"
+            with suppress(TelegramBadRequest):
+                await target_event.answer(
+                    callback_answer_text, show_alert=callback_show_alert
                 )
-        if isinstance(target_event, types.CallbackQuery):
-            await target_event.answer(
-                _("error_occurred_try_again") if is_edit else None
-            )
 
 
 @router.message(CommandStart())
@@ -131,15 +163,14 @@ async def start_command_handler(
     message: types.Message,
     state: FSMContext,
     settings: Settings,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     subscription_service: SubscriptionService,
     session: AsyncSession,
     command: Optional[CommandStart] = None,
 ):
     await state.clear()
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
-    _ = lambda key, **kwargs: i18n.gettext(current_lang, key, **kwargs) if i18n else key
+    current_lang = i18n_data.lang
+    _ = i18n_data.get_text
 
     user = message.from_user
     user_id = user.id
@@ -149,14 +180,14 @@ async def start_command_handler(
         arg_payload = command.args
         if arg_payload.startswith("ref_"):
             try:
-                potential_referrer_id_str = arg_payload.split("_")[1]
+                potential_referrer_id_str = arg_payload[len("ref_"):].partition("_")[0]
                 if potential_referrer_id_str.isdigit():
                     potential_referrer_id = int(potential_referrer_id_str)
                     if potential_referrer_id != user_id:
                         referred_by_user_id = potential_referrer_id
             except (IndexError, ValueError) as e:
                 logging.warning(
-                    f"Could not parse referral from /start args '{arg_payload}': {e}"
+                    "Could not parse referral from /start args '%s': %s", arg_payload, e
                 )
 
     db_user = await user_dal.get_user_by_id(session, user_id)
@@ -174,11 +205,15 @@ async def start_command_handler(
             db_user = await user_dal.create_user(session, user_data_to_create)
 
             logging.info(
-                f"New user {user_id} added to session. Referred by: {referred_by_user_id or 'N/A'}."
+                "New user %s added to session. Referred by: %s.",
+                user_id,
+                referred_by_user_id or "N/A",
             )
         except Exception as e_create:
             logging.error(
-                f"Failed to add new user {user_id} to session: {e_create}",
+                "Failed to add new user %s to session: %s",
+                user_id,
+                e_create,
                 exc_info=True,
             )
             await message.answer(_("error_occurred_processing_request"))
@@ -201,11 +236,13 @@ async def start_command_handler(
                 await user_dal.update_user(session, user_id, update_payload)
 
                 logging.info(
-                    f"Updated existing user {user_id} in session: {update_payload}"
+                    "Updated existing user %s in session: %s", user_id, update_payload
                 )
             except Exception as e_update:
                 logging.error(
-                    f"Failed to update existing user {user_id} in session: {e_update}",
+                    "Failed to update existing user %s in session: %s",
+                    user_id,
+                    e_update,
                     exc_info=True,
                 )
 
@@ -218,12 +255,12 @@ async def start_command_handler(
 @router.callback_query(F.data == "main_action:language")
 async def language_command_handler(
     event: Union[types.Message, types.CallbackQuery],
-    i18n_data: dict,
+    i18n_data: I18nContext,
     settings: Settings,
 ):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
-    _ = lambda key, **kwargs: i18n.gettext(current_lang, key, **kwargs) if i18n else key
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
+    _ = i18n_data.get_text
 
     text_to_send = _(key="choose_language")
     reply_markup = get_language_selection_keyboard(i18n, current_lang)
@@ -240,8 +277,11 @@ async def language_command_handler(
         if event.message:
             try:
                 await event.message.edit_text(text_to_send, reply_markup=reply_markup)
-            except Exception:
-                await target_message_obj.answer(text_to_send, reply_markup=reply_markup)
+            except TelegramBadRequest as e_edit:
+                if "message is not modified" not in e_edit.message:
+                    await target_message_obj.answer(
+                        text_to_send, reply_markup=reply_markup
+                    )
         await event.answer()
     else:
         await target_message_obj.answer(text_to_send, reply_markup=reply_markup)
@@ -250,41 +290,50 @@ async def language_command_handler(
 @router.callback_query(F.data.startswith("set_lang_"))
 async def select_language_callback_handler(
     callback: types.CallbackQuery,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     settings: Settings,
     subscription_service: SubscriptionService,
     session: AsyncSession,
 ):
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    i18n: Optional[JsonI18n] = i18n_data.i18n
     if not i18n or not callback.message:
         await callback.answer("Service error or message context lost.", show_alert=True)
         return
 
-    try:
-        lang_code = callback.data.split("_")[2]
-    except IndexError:
+    lang_code = callback.data[len("set_lang_"):]
+    if not lang_code:
         await callback.answer("Error processing language selection.", show_alert=True)
         return
 
     user_id = callback.from_user.id
     try:
         updated = await user_dal.update_user_language(session, user_id, lang_code)
-        if updated:
-            i18n_data["current_language"] = lang_code
-            _ = lambda key, **kwargs: i18n.gettext(lang_code, key, **kwargs)
-            await callback.answer(_(key="language_set_alert"))
-            logging.info(f"User {user_id} language updated to {lang_code} in session.")
-        else:
-            await callback.answer("Could not set language.", show_alert=True)
-            return
     except Exception as e_lang_update:
         logging.error(
-            f"Error updating lang for user {user_id}: {e_lang_update}", exc_info=True
+            "Error updating lang for user %s: %s",
+            user_id,
+            e_lang_update,
+            exc_info=True,
+        )
+        updated = False
+    if not updated:
+        await callback.answer(
+            i18n_data.get_text("error_occurred_try_again"), show_alert=True
         )
-        await callback.answer("Error setting language.", show_alert=True)
         return
+
+    i18n_data.set_language(lang_code)
+    logging.info("User %s language updated to %s in session.", user_id, lang_code)
+    # send_main_menu answers the query, so the confirmation rides on that
+    # single answer.
     await send_main_menu(
-        callback, settings, i18n_data, subscription_service, session, is_edit=True
+        callback,
+        settings,
+        i18n_data,
+        subscription_service,
+        session,
+        is_edit=True,
+        answer_text=i18n_data.get_text("language_set_alert"),
     )
 
 
@@ -293,7 +342,7 @@ async def main_action_callback_handler(
     callback: types.CallbackQuery,
     state: FSMContext,
     settings: Settings,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     bot: Bot,
     subscription_service: SubscriptionService,
     referral_service: ReferralService,
@@ -301,21 +350,16 @@ async def main_action_callback_handler(
     promo_code_service: PromoCodeService,
     session: AsyncSession,
 ):
-    action = callback.data.split(":")[1]
+    action = callback.data.partition(":")[2]
     user_id = callback.from_user.id
 
-    from . import subscription as user_subscription_handlers
-    from . import referral as user_referral_handlers
-    from . import promo_user as user_promo_handlers
-    from . import trial_handler as user_trial_handlers
-
     if not callback.message:
         await callback.answer("Error: message context lost.", show_alert=True)
         return
 
     if action == "subscribe":
         await user_subscription_handlers.display_subscription_options(
-            callback, i18n_data, settings, session
+            callback, i18n_data, settings
         )
     elif action == "my_subscription":
         await user_subscription_handlers.my_subscription_command_handler(
@@ -325,15 +369,14 @@ async def main_action_callback_handler(
             panel_service,
             subscription_service,
             session,
-            bot,
         )
     elif action == "referral":
         await user_referral_handlers.referral_command_handler(
-            callback, settings, i18n_data, referral_service, bot, session
+            callback, settings, i18n_data, referral_service, bot
         )
     elif action == "apply_promo":
         await user_promo_handlers.prompt_promo_code_input(
-            callback, state, i18n_data, settings, session
+            callback, state, i18n_data, settings
         )
     elif action == "request_trial":
         await user_trial_handlers.request_trial_confirmation_handler(
@@ -346,27 +389,23 @@ async def main_action_callback_handler(
             callback, settings, i18n_data, subscription_service, session, is_edit=True
         )
     else:
-        i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
-        _ = lambda key, **kwargs: (
-            i18n.gettext(i18n_data.get("current_language"), key, **kw) if i18n else key
+        await callback.answer(
+            i18n_data.get_text("main_menu_unknown_action"), show_alert=True
         )
-        await callback.answer(_("main_menu_unknown_action"), show_alert=True)
 
 
 @router.callback_query(F.data.startswith("payment_action:"))
 async def payment_action_callback_handler(
     callback: types.CallbackQuery,
     settings: Settings,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     bot: Bot,
-    session: AsyncSession,
 ):
-    action = callback.data.split(":")[1]
+    action = callback.data.partition(":")[2]
     user_id = callback.from_user.id
 
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
-    _ = lambda key, **kwargs: i18n.gettext(current_lang, key, **kwargs) if i18n else key
+    i18n: Optional[JsonI18n] = i18n_data.i18n
+    _ = i18n_data.get_text
 
     if action == "confirm_paid":
         from db.dal import user_dal
@@ -389,7 +428,16 @@ async def payment_action_callback_handler(
             await callback.message.delete()
         except Exception as e:
             logging.warning(
-                f"Failed to delete payment notification message for user {user_id}: {e}"
+                "Failed to delete payment notification message for user %s: %s",
+                user_id,
+                e,
             )
 
-        logging.info(f"User {user_id} ({user_name}) reported payment confirmation")
+        logging.info("User %s (%s) reported payment confirmation", user_id, user_name)
+
+
+# Imported at the bottom: these modules import send_main_menu from here.
+from . import subscription as user_subscription_handlers
+from . import referral as user_referral_handlers
+from . import promo_user as user_promo_handlers
+from . import trial_handler as user_trial_handlers
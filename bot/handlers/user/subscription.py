@@ -1,14 +1,14 @@
+import asyncio
 import logging
+import re
+import time
+import uuid
+from functools import lru_cache
 from aiogram import Router, F, types, Bot
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.filters import Command
-from aiogram.types import (
-    InlineKeyboardButton,
-    InlineKeyboardMarkup,
-    LabeledPrice,
-    WebAppInfo,
-)
-from typing import Optional, Dict, Any, Union
-from datetime import datetime, timezone
+from typing import Optional, Dict, Any, Set, Tuple, Union
+from datetime import date, datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from config.settings import Settings
 from db.dal import payment_dal
@@ -17,6 +17,8 @@ from bot.keyboards.inline.user_keyboards import (
     get_payment_method_keyboard,
     get_payment_url_keyboard,
     get_back_to_main_menu_markup,
+    get_subscription_not_active_keyboard,
+    get_subscription_details_keyboard,
 )
 from bot.services.yookassa_service import YooKassaService
 from bot.services.stars_service import StarsService
@@ -24,119 +26,177 @@ from bot.services.crypto_pay_service import CryptoPayService
 from bot.services.subscription_service import SubscriptionService
 from bot.services.panel_api_service import PanelApiService
 from bot.services.referral_service import ReferralService
-from bot.middlewares.i18n import JsonI18n
+from bot.middlewares.i18n import JsonI18n, I18nContext
 
 router = Router(name="user_subscription_router")
 
+_SUBSCRIBE_PERIOD_RE = re.compile(r"subscribe_period:(\d+)")
+_PAY_CALLBACK_RE = re.compile(r"(pay_stars|pay_yk|pay_crypto):(\d+):(\d+(?:\.\d+)?)")
+
+_MESSAGE_NOT_MODIFIED = "message is not modified"
+
+_YOOKASSA_CURRENCY = "RUB"
+_YOOKASSA_PAYMENT_RECORD_DEFAULTS = {
+    "currency": _YOOKASSA_CURRENCY,
+    "status": "pending_yookassa",
+}
+# Users whose YooKassa payment is being created, so a double tap does not
+# create a second payment.
+_YOOKASSA_PAYMENTS_IN_FLIGHT: Set[int] = set()
+
+_GIB = 1 << 30
+_HALF_GIB = _GIB >> 1
+_PANEL_STATUS_DISPLAY = {
+    status: status.capitalize()
+    for status in ("ACTIVE", "DISABLED", "LIMITED", "EXPIRED", "UNKNOWN")
+}
+
+# Filled at startup by precompute_payment_descriptions, keyed by
+# (lang, months).
+_PAYMENT_DESCRIPTIONS: Dict[Tuple[str, int], str] = {}
+
+
+def precompute_payment_descriptions(settings: Settings, i18n_instance: JsonI18n) -> None:
+    """Render the payment description for every language and period."""
+    _PAYMENT_DESCRIPTIONS.clear()
+    for lang in i18n_instance.locales_data:
+        for months in settings.subscription_options:
+            _PAYMENT_DESCRIPTIONS[(lang, months)] = i18n_instance.gettext(
+                lang, "payment_description_subscription", months=months
+            )
 
-async def display_subscription_options(
-    event: Union[types.Message, types.CallbackQuery],
-    i18n_data: dict,
-    settings: Settings,
-    session: AsyncSession,
-):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
 
-    get_text = lambda key, **kwargs: (
-        i18n.gettext(current_lang, key, **kwargs) if i18n else key
-    )
+def _payment_description(i18n_data: I18nContext, months: int) -> str:
+    description = _PAYMENT_DESCRIPTIONS.get((i18n_data.lang, months))
+    if description is None:
+        description = i18n_data.get_text("payment_description_subscription", months=months)
+    return description
 
-    if not i18n:
-        err_msg = "Language service error."
-        if isinstance(event, types.CallbackQuery):
-            await event.answer(err_msg, show_alert=True)
-        elif isinstance(event, types.Message):
-            await event.answer(err_msg)
-        return
 
-    currency_symbol_val = settings.DEFAULT_CURRENCY_SYMBOL
-    text_content = (
-        get_text("select_subscription_period")
-        if settings.subscription_options
-        else get_text("no_subscription_options_available")
-    )
+@lru_cache(maxsize=1024)
+def _parse_payment_cb(data: str) -> Optional[Tuple[str, int, Union[int, float]]]:
+    """Parse ``<kind>:<months>:<price>`` payment callback data.
 
-    reply_markup = (
-        get_subscription_options_keyboard(
-            settings.subscription_options, currency_symbol_val, current_lang, i18n
-        )
-        if settings.subscription_options
-        else get_back_to_main_menu_markup(current_lang, i18n)
-    )
+    Stars prices are whole numbers; fiat prices may carry a fraction.
+    """
+    match = _PAY_CALLBACK_RE.fullmatch(data)
+    if not match:
+        return None
+    kind, months, price = match[1], int(match[2]), match[3]
+    if kind == "pay_stars":
+        return (kind, months, int(price)) if price.isdigit() else None
+    return kind, months, float(price)
 
-    target_message_obj = (
-        event.message if isinstance(event, types.CallbackQuery) else event
-    )
-    if not target_message_obj:
-        if isinstance(event, types.CallbackQuery):
-            await event.answer(get_text("error_occurred_try_again"), show_alert=True)
-        return
+
+async def _edit_or_send(message: types.Message, text: str, **kwargs: Any) -> None:
+    """Edit ``message`` in place, or send a new one if it cannot be edited."""
+    try:
+        await message.edit_text(text, **kwargs)
+    except TelegramBadRequest as e_edit:
+        if _MESSAGE_NOT_MODIFIED in e_edit.message:
+            return
+        logging.warning("Failed to edit message: %s. Sending new one.", e_edit)
+        await message.answer(text, **kwargs)
+
+
+def _format_gib(n_bytes: int) -> str:
+    # Hundredths of a GiB, rounded, without going through float.
+    gib, hundredths = divmod((int(n_bytes) * 100 + _HALF_GIB) // _GIB, 100)
+    return f"{gib}.{hundredths:02d} GB"
+
+
+@lru_cache(maxsize=1024)
+def _format_end_date(end_date: datetime) -> str:
+    return end_date.strftime("%d.%m.%Y, %H:%M")
+
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _days_left(end_date: datetime) -> int:
+    # Day counting from the epoch clock avoids building datetime/date objects
+    # for "today" on every render.
+    today_ordinal = _EPOCH_ORDINAL + int(time.time()) // 86400
+    return max(0, end_date.toordinal() - today_ordinal)
+
+
+async def display_subscription_options(
+    event: Union[types.Message, types.CallbackQuery],
+    i18n_data: I18nContext,
+    settings: Settings,
+):
+    current_lang = i18n_data.lang
+    i18n: JsonI18n = i18n_data.i18n
+    get_text = i18n_data.get_text
+
+    subscription_options = settings.subscription_options
+    if subscription_options:
+        text_content = get_text("select_subscription_period")
+        reply_markup = get_subscription_options_keyboard(
+            subscription_options,
+            settings.DEFAULT_CURRENCY_SYMBOL,
+            current_lang,
+            i18n,
+            settings.subscription_options_key,
+        )
+    else:
+        text_content = get_text("no_subscription_options_available")
+        reply_markup = get_back_to_main_menu_markup(current_lang, i18n)
 
     if isinstance(event, types.CallbackQuery):
-        try:
-            await target_message_obj.edit_text(text_content, reply_markup=reply_markup)
-        except Exception:
-            await target_message_obj.answer(text_content, reply_markup=reply_markup)
+        if not event.message:
+            await event.answer(get_text("error_occurred_try_again"), show_alert=True)
+            return
+        await _edit_or_send(event.message, text_content, reply_markup=reply_markup)
         await event.answer()
     else:
-        await target_message_obj.answer(text_content, reply_markup=reply_markup)
+        await event.answer(text_content, reply_markup=reply_markup)
 
 
 @router.callback_query(F.data.startswith("subscribe_period:"))
 async def select_subscription_period_callback_handler(
     callback: types.CallbackQuery,
     settings: Settings,
-    i18n_data: dict,
-    session: AsyncSession,
+    i18n_data: I18nContext,
 ):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
-    get_text = lambda key, **kwargs: (
-        i18n.gettext(current_lang, key, **kwargs) if i18n else key
-    )
+    current_lang = i18n_data.lang
+    i18n: JsonI18n = i18n_data.i18n
+    get_text = i18n_data.get_text
 
-    if not i18n or not callback.message:
+    if not callback.message:
         await callback.answer(get_text("error_occurred_try_again"), show_alert=True)
         return
 
-    try:
-        months = int(callback.data.split(":")[-1])
-    except (ValueError, IndexError):
-        logging.error(f"Invalid subscription period in callback_data: {callback.data}")
+    match = _SUBSCRIBE_PERIOD_RE.fullmatch(callback.data)
+    if not match:
+        logging.error("Invalid subscription period in callback_data: %s", callback.data)
         await callback.answer(get_text("error_try_again"), show_alert=True)
         return
+    months = int(match[1])
 
-    price_rub = settings.subscription_options.get(months)
-    if price_rub is None:
+    pricing = settings.pricing.get(months)
+    if pricing is None:
         logging.error(
-            f"Price not found for {months} months subscription period in settings.subscription_options."
+            "Price not found for %s months subscription period in settings.subscription_options.",
+            months,
         )
         await callback.answer(get_text("error_try_again"), show_alert=True)
         return
 
     currency_symbol_val = settings.DEFAULT_CURRENCY_SYMBOL
     text_content = get_text("choose_payment_method")
-    tribute_url = settings.tribute_payment_links.get(months)
-    stars_price = settings.stars_subscription_options.get(months)
     reply_markup = get_payment_method_keyboard(
         months,
-        price_rub,
-        tribute_url,
-        stars_price,
+        pricing.rub,
+        pricing.tribute_url,
+        pricing.stars,
         currency_symbol_val,
         current_lang,
         i18n,
         settings,
     )
 
-    try:
-        await callback.message.edit_text(text_content, reply_markup=reply_markup)
-    except Exception as e_edit:
-        logging.warning(
-            f"Edit message for payment method selection failed: {e_edit}. Sending new one."
-        )
-        await callback.message.answer(text_content, reply_markup=reply_markup)
+    await _edit_or_send(callback.message, text_content, reply_markup=reply_markup)
     await callback.answer()
 
 
@@ -144,41 +204,32 @@ async def select_subscription_period_callback_handler(
 async def pay_stars_callback_handler(
     callback: types.CallbackQuery,
     settings: Settings,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     session: AsyncSession,
     bot: Bot,
     stars_service: StarsService,
 ):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
+    get_text = i18n_data.get_text
 
-    get_text = lambda key, **kwargs: (
-        i18n.gettext(current_lang, key, **kwargs) if i18n else key
-    )
-
-    if not i18n or not callback.message:
+    if not callback.message:
         await callback.answer(get_text("error_occurred_try_again"), show_alert=True)
         return
 
-    try:
-        _, data_payload = callback.data.split(":", 1)
-        months_str, price_str = data_payload.split(":")
-        months = int(months_str)
-        stars_price = int(price_str)
-    except (ValueError, IndexError):
-        logging.error(f"Invalid pay_stars data in callback: {callback.data}")
+    parsed = _parse_payment_cb(callback.data)
+    if not parsed:
+        logging.error("Invalid pay_stars data in callback: %s", callback.data)
         await callback.answer(get_text("error_try_again"), show_alert=True)
         return
+    _, months, stars_price = parsed
 
     user_id = callback.from_user.id
-    payment_description = get_text("payment_description_subscription", months=months)
+    payment_description = _payment_description(i18n_data, months)
 
     payment_id = await stars_service.create_invoice(
         session, user_id, months, stars_price, payment_description
     )
     if payment_id is None:
-        await callback.message.edit_text(get_text("error_payment_gateway"))
-        await callback.answer(get_text("error_try_again"), show_alert=True)
+        await callback.answer(get_text("error_payment_gateway"), show_alert=True)
         return
 
     await callback.answer()
@@ -188,114 +239,135 @@ async def pay_stars_callback_handler(
 async def pay_yk_callback_handler(
     callback: types.CallbackQuery,
     settings: Settings,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     yookassa_service: YooKassaService,
     session: AsyncSession,
 ):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
-
-    get_text = lambda key, **kwargs: (
-        i18n.gettext(current_lang, key, **kwargs) if i18n else key
-    )
-
-    if not i18n or not callback.message:
+    get_text = i18n_data.get_text
 
+    if not callback.message:
         await callback.answer(get_text("error_occurred_try_again"), show_alert=True)
         return
 
     if not yookassa_service or not yookassa_service.configured:
         logging.error("YooKassa service is not configured or unavailable.")
-        target_msg_edit = callback.message
-        await target_msg_edit.edit_text(get_text("payment_service_unavailable"))
         await callback.answer(
             get_text("payment_service_unavailable_alert"), show_alert=True
         )
         return
 
-    try:
-        _, data_payload = callback.data.split(":", 1)
-        months_str, price_str = data_payload.split(":")
-        months = int(months_str)
-        price_rub = float(price_str)
-    except (ValueError, IndexError):
-        logging.error(f"Invalid pay_yk data in callback: {callback.data}")
+    parsed = _parse_payment_cb(callback.data)
+    if not parsed:
+        logging.error("Invalid pay_yk data in callback: %s", callback.data)
         await callback.answer(get_text("error_try_again"), show_alert=True)
         return
+    _, months, price_rub = parsed
 
     user_id = callback.from_user.id
+    if user_id in _YOOKASSA_PAYMENTS_IN_FLIGHT:
+        # A double tap while the first payment is still being created.
+        await callback.answer(get_text("payment_creation_in_progress"))
+        return
 
-    payment_description = get_text("payment_description_subscription", months=months)
-    currency_code_for_yk = "RUB"
+    # Acknowledge before the DB insert and the YooKassa round-trip so the
+    # button spinner stops right away; errors from here on are shown in
+    # the message instead of an alert.
+    await callback.answer()
+
+    _YOOKASSA_PAYMENTS_IN_FLIGHT.add(user_id)
+    try:
+        await _create_yookassa_payment(
+            callback, i18n_data, yookassa_service, session, user_id, months, price_rub
+        )
+    finally:
+        _YOOKASSA_PAYMENTS_IN_FLIGHT.discard(user_id)
 
+
+async def _create_yookassa_payment(
+    callback: types.CallbackQuery,
+    i18n_data: I18nContext,
+    yookassa_service: YooKassaService,
+    session: AsyncSession,
+    user_id: int,
+    months: int,
+    price_rub: float,
+):
+    current_lang = i18n_data.lang
+    i18n: JsonI18n = i18n_data.i18n
+    get_text = i18n_data.get_text
+
+    payment_description = _payment_description(i18n_data, months)
+    # Generated here so the same key is stored with the pending record and
+    # sent to YooKassa.
+    idempotence_key = str(uuid.uuid4())
     payment_record_data = {
+        **_YOOKASSA_PAYMENT_RECORD_DEFAULTS,
         "user_id": user_id,
         "amount": price_rub,
-        "currency": currency_code_for_yk,
-        "status": "pending_yookassa",
         "description": payment_description,
         "subscription_duration_months": months,
+        "idempotence_key": idempotence_key,
     }
     db_payment_record = None
     try:
+        # Flushed only: the record is committed once, together with the
+        # YooKassa payment id or the failure status below.
         db_payment_record = await payment_dal.create_payment_record(
             session, payment_record_data
         )
-        await session.commit()
         logging.info(
-            f"Payment record {db_payment_record.payment_id} created for user {user_id} with status 'pending_yookassa'."
+            "Payment record %s created for user %s with status 'pending_yookassa'.",
+            db_payment_record.payment_id,
+            user_id,
         )
     except Exception as e_db_payment:
         await session.rollback()
         logging.error(
-            f"Failed to create payment record in DB for user {user_id}: {e_db_payment}",
+            "Failed to create payment record in DB for user %s: %s",
+            user_id,
+            e_db_payment,
             exc_info=True,
         )
-        await callback.message.edit_text(get_text("error_creating_payment_record"))
-        await callback.answer(get_text("error_try_again"), show_alert=True)
+        await _edit_or_send(callback.message, get_text("error_creating_payment_record"))
         return
 
     if not db_payment_record:
-        await callback.message.edit_text(get_text("error_creating_payment_record"))
-        await callback.answer(get_text("error_try_again"), show_alert=True)
+        await _edit_or_send(callback.message, get_text("error_creating_payment_record"))
         return
 
-    yookassa_metadata = {
-        "user_id": str(user_id),
-        "subscription_months": str(months),
-        "payment_db_id": str(db_payment_record.payment_id),
-    }
-    receipt_email_for_yk = settings.YOOKASSA_DEFAULT_RECEIPT_EMAIL
-
+    # The receipt contact falls back to YOOKASSA_DEFAULT_RECEIPT_EMAIL inside
+    # the service, so it is not looked up here.
     payment_response_yk = await yookassa_service.create_payment(
         amount=price_rub,
-        currency=currency_code_for_yk,
+        currency=_YOOKASSA_CURRENCY,
         description=payment_description,
-        metadata=yookassa_metadata,
-        receipt_email=receipt_email_for_yk,
+        metadata={
+            "user_id": str(user_id),
+            "subscription_months": str(months),
+            "payment_db_id": str(db_payment_record.payment_id),
+        },
+        idempotence_key=idempotence_key,
     )
 
     if payment_response_yk and payment_response_yk.get("confirmation_url"):
+        db_payment_record.status = payment_response_yk.get("status", "pending")
+        db_payment_record.yookassa_payment_id = payment_response_yk.get("id")
         try:
-            await payment_dal.update_payment_status_by_db_id(
-                session,
-                payment_db_id=db_payment_record.payment_id,
-                new_status=payment_response_yk.get("status", "pending"),
-                yk_payment_id=payment_response_yk.get("id"),
-            )
             await session.commit()
         except Exception as e_db_update_ykid:
             await session.rollback()
             logging.error(
-                f"Failed to update payment record {db_payment_record.payment_id} with YK ID: {e_db_update_ykid}",
+                "Failed to update payment record %s with YK ID: %s",
+                db_payment_record.payment_id,
+                e_db_update_ykid,
                 exc_info=True,
             )
-            await callback.message.edit_text(
-                get_text("error_payment_gateway_link_failed")
+            await _edit_or_send(
+                callback.message, get_text("error_payment_gateway_link_failed")
             )
-            await callback.answer(get_text("error_try_again"), show_alert=True)
             return
 
+        # The link is only shown once the YooKassa id is committed.
         await callback.message.edit_text(
             get_text(key="payment_link_message", months=months),
             reply_markup=get_payment_url_keyboard(
@@ -303,107 +375,123 @@ async def pay_yk_callback_handler(
             ),
             disable_web_page_preview=False,
         )
-    else:
-        try:
-            await payment_dal.update_payment_status_by_db_id(
-                session, db_payment_record.payment_id, "failed_creation"
-            )
-            await session.commit()
-        except Exception as e_db_fail_create:
-            await session.rollback()
-            logging.error(
-                f"Additionally failed to update payment record to 'failed_creation': {e_db_fail_create}",
-                exc_info=True,
-            )
+        return
 
+    logging.error(
+        "Failed to create payment in YooKassa for user %s, payment_db_id %s. Response: %s",
+        user_id,
+        db_payment_record.payment_id,
+        payment_response_yk,
+    )
+    db_payment_record.status = "failed_creation"
+    commit_result, edit_result = await asyncio.gather(
+        session.commit(),
+        callback.message.edit_text(get_text("error_payment_gateway")),
+        return_exceptions=True,
+    )
+    if isinstance(commit_result, Exception):
+        await session.rollback()
         logging.error(
-            f"Failed to create payment in YooKassa for user {user_id}, payment_db_id {db_payment_record.payment_id}. Response: {payment_response_yk}"
+            "Additionally failed to update payment record to 'failed_creation': %s",
+            commit_result,
+            exc_info=commit_result,
         )
-        await callback.message.edit_text(get_text("error_payment_gateway"))
-
-    await callback.answer()
+    if isinstance(edit_result, Exception):
+        raise edit_result
 
 
 @router.callback_query(F.data.startswith("pay_crypto:"))
 async def pay_crypto_callback_handler(
     callback: types.CallbackQuery,
     settings: Settings,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     cryptopay_service: CryptoPayService,
     session: AsyncSession,
 ):
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
-    get_text = lambda key, **kwargs: (
-        i18n.gettext(current_lang, key, **kwargs) if i18n else key
-    )
+    current_lang = i18n_data.lang
+    i18n: JsonI18n = i18n_data.i18n
+    get_text = i18n_data.get_text
 
-    if not i18n or not callback.message:
+    if not callback.message:
         await callback.answer(get_text("error_occurred_try_again"), show_alert=True)
         return
 
     if not cryptopay_service or not cryptopay_service.configured:
-        await callback.message.edit_text(get_text("payment_service_unavailable"))
         await callback.answer(
             get_text("payment_service_unavailable_alert"), show_alert=True
         )
         return
 
-    try:
-        _, data_payload = callback.data.split(":", 1)
-        months_str, amount_str = data_payload.split(":")
-        months = int(months_str)
-        amount_val = float(amount_str)
-    except (ValueError, IndexError):
-        logging.error(f"Invalid pay_crypto data in callback: {callback.data}")
+    parsed = _parse_payment_cb(callback.data)
+    if not parsed:
+        logging.error("Invalid pay_crypto data in callback: %s", callback.data)
         await callback.answer(get_text("error_try_again"), show_alert=True)
         return
+    _, months, amount_val = parsed
 
     user_id = callback.from_user.id
-    description = get_text("payment_description_subscription", months=months)
+    description = _payment_description(i18n_data, months)
 
     invoice_url = await cryptopay_service.create_invoice(
         session, user_id, months, amount_val, description
     )
     if invoice_url:
-        await callback.message.edit_text(
+        edit_coro = callback.message.edit_text(
             get_text("payment_link_message", months=months),
             reply_markup=get_payment_url_keyboard(invoice_url, current_lang, i18n),
             disable_web_page_preview=False,
         )
     else:
-        await callback.message.edit_text(get_text("error_payment_gateway"))
-    await callback.answer()
+        edit_coro = callback.message.edit_text(get_text("error_payment_gateway"))
+    await asyncio.gather(edit_coro, callback.answer())
 
 
 @router.callback_query(F.data == "main_action:subscribe")
 async def reshow_subscription_options_callback(
     callback: types.CallbackQuery,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     settings: Settings,
-    session: AsyncSession,
 ):
-    await display_subscription_options(callback, i18n_data, settings, session)
+    await display_subscription_options(callback, i18n_data, settings)
 
 
 async def my_subscription_command_handler(
     event: Union[types.Message, types.CallbackQuery],
-    i18n_data: dict,
+    i18n_data: I18nContext,
     settings: Settings,
     panel_service: PanelApiService,
     subscription_service: SubscriptionService,
     session: AsyncSession,
-    bot: Bot,
 ):
-    target = event.message if isinstance(event, types.CallbackQuery) else event
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: JsonI18n = i18n_data.get("i18n_instance")
-    get_text = lambda key, **kw: i18n.gettext(current_lang, key, **kw)
-
-    if not i18n or not target:
-        if isinstance(event, types.Message):
-            await event.answer(get_text("error_occurred_try_again"))
+    is_callback = isinstance(event, types.CallbackQuery)
+    target = event.message if is_callback else event
+    if not target:
         return
+    await _render_subscription(
+        event,
+        target,
+        is_callback,
+        i18n_data,
+        settings,
+        panel_service,
+        subscription_service,
+        session,
+    )
+
+
+async def _render_subscription(
+    event: Union[types.Message, types.CallbackQuery],
+    target: types.Message,
+    is_callback: bool,
+    i18n_data: I18nContext,
+    settings: Settings,
+    panel_service: PanelApiService,
+    subscription_service: SubscriptionService,
+    session: AsyncSession,
+):
+    current_lang = i18n_data.lang
+    i18n: JsonI18n = i18n_data.i18n
+    get_text = i18n_data.get_text
 
     if not panel_service or not subscription_service:
         await target.answer(get_text("error_service_unavailable"))
@@ -415,81 +503,52 @@ async def my_subscription_command_handler(
 
     if not active:
         text = get_text("subscription_not_active")
-        buy_button = InlineKeyboardButton(
-            text=get_text("menu_subscribe_inline", default="Купить"),
-            callback_data="main_action:subscribe",
-        )
-        back_markup = get_back_to_main_menu_markup(current_lang, i18n)
-        kb = InlineKeyboardMarkup(
-            inline_keyboard=[[buy_button], *back_markup.inline_keyboard]
-        )
+        kb = get_subscription_not_active_keyboard(current_lang, i18n)
 
-        if isinstance(event, types.CallbackQuery):
+        if is_callback:
             await event.answer()
-            try:
-                await event.message.edit_text(text, reply_markup=kb)
-            except:
-                await event.message.answer(text, reply_markup=kb)
+            await _edit_or_send(target, text, reply_markup=kb)
         else:
-            await event.answer(text, reply_markup=kb)
+            await target.answer(text, reply_markup=kb)
         return
 
-    end_date = active.get("end_date")
-    days_left = (end_date.date() - datetime.now().date()).days if end_date else 0
-    text = get_text(
-        "my_subscription_details",
-        end_date=end_date.strftime("%d.%m.%Y, %H:%M") if end_date else "N/A",
-        days_left=max(0, days_left),
-        status=active.get("status_from_panel", get_text("status_active")).capitalize(),
-        config_link=active.get("config_link") or get_text("config_link_not_available"),
+    end_date = active.end_date
+    days_left = _days_left(end_date) if end_date else 0
+    status_from_panel = active.status_from_panel or get_text("status_active")
+    format_details = i18n.get_formatter(current_lang, "my_subscription_details")
+    text = format_details(
+        end_date=_format_end_date(end_date) if end_date else "N/A",
+        days_left=days_left,
+        status=(
+            _PANEL_STATUS_DISPLAY.get(status_from_panel)
+            or status_from_panel.capitalize()
+        ),
+        config_link=active.config_link or get_text("config_link_not_available"),
         traffic_limit=(
-            f"{active['traffic_limit_bytes'] / 2**30:.2f} GB"
-            if active.get("traffic_limit_bytes")
+            _format_gib(active.traffic_limit_bytes)
+            if active.traffic_limit_bytes
             else get_text("traffic_unlimited")
         ),
         traffic_used=(
-            f"{active['traffic_used_bytes'] / 2**30:.2f} GB"
-            if active.get("traffic_used_bytes") is not None
+            _format_gib(active.traffic_used_bytes)
+            if active.traffic_used_bytes is not None
             else get_text("traffic_na")
         ),
     )
 
-    buttons = []
-
-    if settings.SUBSCRIPTION_MINI_APP_URL:
-        from aiogram.types import WebAppInfo
-
-        buttons.append(
-            [
-                InlineKeyboardButton(
-                    text=get_text("connect_button"),
-                    web_app=WebAppInfo(url=settings.SUBSCRIPTION_MINI_APP_URL),
-                )
-            ]
-        )
-
-    back_markup = get_back_to_main_menu_markup(current_lang, i18n)
-    buttons.extend(back_markup.inline_keyboard)
-
-    markup = InlineKeyboardMarkup(inline_keyboard=buttons)
+    markup = get_subscription_details_keyboard(
+        current_lang, i18n, settings.SUBSCRIPTION_MINI_APP_URL
+    )
 
-    if isinstance(event, types.CallbackQuery):
+    if is_callback:
         await event.answer()
-        try:
-            await event.message.edit_text(
-                text,
-                reply_markup=markup,
-                parse_mode="HTML",
-                disable_web_page_preview=True,
-            )
-        except:
-            await bot.send_message(
-                chat_id=target.chat.id,
-                text=text,
-                reply_markup=markup,
-                parse_mode="HTML",
-                disable_web_page_preview=True,
-            )
+        await _edit_or_send(
+            target,
+            text,
+            reply_markup=markup,
+            parse_mode="HTML",
+            disable_web_page_preview=True,
+        )
     else:
         await target.answer(
             text, reply_markup=markup, parse_mode="HTML", disable_web_page_preview=True
@@ -505,7 +564,7 @@ async def stars_pre_checkout_handler(pre_checkout_query: types.PreCheckoutQuery)
 async def stars_successful_payment_handler(
     message: types.Message,
     settings: Settings,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     session: AsyncSession,
     stars_service: StarsService,
 ):
@@ -515,11 +574,11 @@ async def stars_successful_payment_handler(
 
     payload = sp.invoice_payload or ""
     try:
-        payment_id_str, months_str = payload.split(":")
+        payment_id_str, _, months_str = payload.partition(":")
         payment_db_id = int(payment_id_str)
         months = int(months_str)
-    except (ValueError, IndexError):
-        logging.error(f"Invalid invoice payload for stars payment: {payload}")
+    except ValueError:
+        logging.error("Invalid invoice payload for stars payment: %s", payload)
         return
 
     stars_amount = sp.total_amount
@@ -531,14 +590,20 @@ async def stars_successful_payment_handler(
 @router.message(Command("sub"))
 async def connect_command_handler(
     message: types.Message,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     settings: Settings,
     panel_service: PanelApiService,
     subscription_service: SubscriptionService,
     session: AsyncSession,
-    bot: Bot,
 ):
-    logging.info(f"User {message.from_user.id} used /sub command.")
-    await my_subscription_command_handler(
-        message, i18n_data, settings, panel_service, subscription_service, session, bot
+    logging.info("User %s used /sub command.", message.from_user.id)
+    await _render_subscription(
+        message,
+        message,
+        False,
+        i18n_data,
+        settings,
+        panel_service,
+        subscription_service,
+        session,
     )
@@ -1,6 +1,8 @@
+import asyncio
 import logging
 from aiogram import Router, F, types, Bot
-from typing import Optional
+from aiogram.exceptions import TelegramBadRequest
+from typing import Optional, Set
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
@@ -12,33 +14,31 @@ from bot.keyboards.inline.user_keyboards import (
     get_trial_confirmation_keyboard,
     get_main_menu_inline_keyboard,
 )
-from bot.middlewares.i18n import JsonI18n
+from bot.middlewares.i18n import JsonI18n, I18nContext
 from .start import send_main_menu
 
 router = Router(name="user_trial_router")
 
+# Users whose trial confirmation is being processed.
+_TRIAL_ACTIVATIONS_IN_FLIGHT: Set[int] = set()
+
 
 async def request_trial_confirmation_handler(
     callback: types.CallbackQuery,
     settings: Settings,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     subscription_service: SubscriptionService,
     session: AsyncSession,
 ):
     user_id = callback.from_user.id
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
-    _ = lambda key, **kwargs: i18n.gettext(current_lang, key, **kwargs) if i18n else key
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
+    _ = i18n_data.get_text
 
     if not i18n or not callback.message:
         await callback.answer(_("error_occurred_try_again"), show_alert=True)
         return
 
-    show_trial_btn_in_menu_if_fail = False
-    if settings.TRIAL_ENABLED:
-        if not await subscription_service.has_had_any_subscription(session, user_id):
-            show_trial_btn_in_menu_if_fail = True
-
     if not settings.TRIAL_ENABLED:
         await callback.message.edit_text(
             _("trial_feature_disabled"),
@@ -80,16 +80,43 @@ async def request_trial_confirmation_handler(
 async def confirm_activate_trial_handler(
     callback: types.CallbackQuery,
     settings: Settings,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     subscription_service: SubscriptionService,
     panel_service: PanelApiService,
     session: AsyncSession,
 ):
     user_id = callback.from_user.id
+    if user_id in _TRIAL_ACTIVATIONS_IN_FLIGHT:
+        # A double tap: the first callback checks eligibility, activates the
+        # trial and renders the result for this same message.
+        await callback.answer()
+        return
+
+    _TRIAL_ACTIVATIONS_IN_FLIGHT.add(user_id)
+    try:
+        await _confirm_activate_trial(
+            callback,
+            settings,
+            i18n_data,
+            subscription_service,
+            session,
+        )
+    finally:
+        _TRIAL_ACTIVATIONS_IN_FLIGHT.discard(user_id)
 
-    current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
-    i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
-    _ = lambda key, **kwargs: i18n.gettext(current_lang, key, **kwargs) if i18n else key
+
+async def _confirm_activate_trial(
+    callback: types.CallbackQuery,
+    settings: Settings,
+    i18n_data: I18nContext,
+    subscription_service: SubscriptionService,
+    session: AsyncSession,
+):
+    user_id = callback.from_user.id
+
+    current_lang = i18n_data.lang
+    i18n: Optional[JsonI18n] = i18n_data.i18n
+    _ = i18n_data.get_text
 
     if not i18n or not callback.message:
         await callback.answer(_("error_occurred_try_again"), show_alert=True)
@@ -102,7 +129,10 @@ async def confirm_activate_trial_handler(
             callback, settings, i18n_data, subscription_service, session, is_edit=True
         )
         return
-    if await subscription_service.has_had_any_subscription(session, user_id):
+    had_subscription = await subscription_service.has_had_any_subscription(
+        session, user_id
+    )
+    if had_subscription:
         await callback.answer(
             _("trial_already_had_subscription_or_trial"), show_alert=True
         )
@@ -119,8 +149,6 @@ async def confirm_activate_trial_handler(
     show_trial_button_after_action = False
 
     if activation_result and activation_result.get("activated"):
-        await callback.answer(_("trial_activated_alert"), show_alert=True)
-
         end_date_obj = activation_result.get("end_date")
         config_link_for_trial = activation_result.get("subscription_url") or _(
             "config_link_not_available"
@@ -154,57 +182,83 @@ async def confirm_activate_trial_handler(
         )
         final_message_text_in_chat = _(message_key_from_service)
         await callback.answer(final_message_text_in_chat, show_alert=True)
-        if (
-            settings.TRIAL_ENABLED
-            and not await subscription_service.has_had_any_subscription(
-                session, user_id
+        # A failed activation leaves no subscription behind, so the answer
+        # from the gate above still holds.
+        show_trial_button_after_action = (
+            settings.TRIAL_ENABLED and not had_subscription
+        )
+
+    show_result = _show_trial_result(
+        callback,
+        final_message_text_in_chat,
+        current_lang,
+        i18n,
+        settings,
+        show_trial_button_after_action,
+    )
+    if activation_result and activation_result.get("activated"):
+        # The alert, the result message and the admin notification are
+        # independent Telegram requests.
+        pending = [
+            callback.answer(_("trial_activated_alert"), show_alert=True),
+            show_result,
+        ]
+        if end_date_obj:
+            pending.append(
+                notify_admin_new_trial(
+                    callback.bot,
+                    settings,
+                    i18n,
+                    user_id,
+                    end_date_obj,
+                )
             )
-        ):
-            show_trial_button_after_action = True
+        await asyncio.gather(*pending)
+    else:
+        await show_result
+
 
+async def _show_trial_result(
+    callback: types.CallbackQuery,
+    text: str,
+    current_lang: str,
+    i18n: JsonI18n,
+    settings: Settings,
+    show_trial_button: bool,
+):
+    markup = get_main_menu_inline_keyboard(
+        current_lang, i18n, settings, show_trial_button
+    )
     try:
         await callback.message.edit_text(
-            final_message_text_in_chat,
+            text,
             parse_mode="HTML",
-            reply_markup=get_main_menu_inline_keyboard(
-                current_lang, i18n, settings, show_trial_button_after_action
-            ),
+            reply_markup=markup,
             disable_web_page_preview=True,
         )
-    except Exception as e_edit:
-        logging.warning(
-            f"Could not edit trial result message: {e_edit}. Sending new one."
-        )
-
-        if (
-            callback.message
-            and hasattr(callback.message, "chat")
-            and callback.message.chat
-        ):
-            await callback.message.chat.send_message(
-                final_message_text_in_chat,
-                parse_mode="HTML",
-                reply_markup=get_main_menu_inline_keyboard(
-                    current_lang, i18n, settings, show_trial_button_after_action
-                ),
-                disable_web_page_preview=True,
+    except TelegramBadRequest as e_edit:
+        if "message is not modified" not in e_edit.message:
+            logging.warning(
+                f"Could not edit trial result message: {e_edit}. Sending new one."
             )
-
-    if activation_result and activation_result.get("activated") and end_date_obj:
-        await notify_admin_new_trial(
-            callback.bot,
-            settings,
-            i18n,
-            user_id,
-            end_date_obj,
-        )
+            if (
+                callback.message
+                and hasattr(callback.message, "chat")
+                and callback.message.chat
+            ):
+                await callback.message.chat.send_message(
+                    text,
+                    parse_mode="HTML",
+                    reply_markup=markup,
+                    disable_web_page_preview=True,
+                )
 
 
 @router.callback_query(F.data == "main_action:cancel_trial")
 async def cancel_trial_activation(
     callback: types.CallbackQuery,
     settings: Settings,
-    i18n_data: dict,
+    i18n_data: I18nContext,
     subscription_service: SubscriptionService,
     session: AsyncSession,
 ):
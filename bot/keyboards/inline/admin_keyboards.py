@@ -1,16 +1,28 @@
 from aiogram.utils.keyboard import InlineKeyboardBuilder, InlineKeyboardButton
 from aiogram.types import InlineKeyboardMarkup, WebAppInfo
 from typing import Optional, List, Any
-import math
+import functools
 
 from config.settings import Settings
-from bot.middlewares.i18n import JsonI18n
+from bot.middlewares.i18n import JsonI18n, bind_gettext
 from db.models import User
 
+# %-templates for the per-row callback data of the banned users list.
+_USER_CARD_CALLBACK = "admin_user_card:%d:%d"
+_VIEW_BANNED_CALLBACK = "admin_action:view_banned:%d"
+
 
 def get_admin_panel_keyboard(i18n_instance, lang: str,
                              settings: Settings) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
+    return _build_admin_panel_keyboard(i18n_instance, lang)
+
+
+# The static admin keyboards only depend on the language, so each markup is
+# built once and shared between callbacks.
+@functools.lru_cache(maxsize=32)
+def _build_admin_panel_keyboard(i18n_instance,
+                                lang: str) -> InlineKeyboardMarkup:
+    _ = bind_gettext(i18n_instance, lang)
     builder = InlineKeyboardBuilder()
     builder.button(text=_(key="admin_stats_button"),
                    callback_data="admin_action:stats")
@@ -36,8 +48,9 @@ def get_admin_panel_keyboard(i18n_instance, lang: str,
     return builder.as_markup()
 
 
+@functools.lru_cache(maxsize=32)
 def get_logs_menu_keyboard(i18n_instance, lang: str) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
+    _ = bind_gettext(i18n_instance, lang)
     builder = InlineKeyboardBuilder()
     builder.button(text=_(key="admin_view_all_logs_button"),
                    callback_data="admin_logs:view_all:0")
@@ -56,7 +69,7 @@ def get_logs_pagination_keyboard(
         i18n_instance,
         lang: str,
         back_to_logs_menu: bool = False) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
+    _ = bind_gettext(i18n_instance, lang)
     builder = InlineKeyboardBuilder()
     row_buttons = []
     if current_page > 0:
@@ -87,42 +100,40 @@ def get_banned_users_keyboard(banned_users: List[User], current_page: int,
                               total_banned: int, i18n_instance: JsonI18n,
                               lang: str,
                               settings: Settings) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
+    _ = bind_gettext(i18n_instance, lang)
     builder = InlineKeyboardBuilder()
     page_size = settings.LOGS_PAGE_SIZE
 
     if not banned_users and total_banned == 0:
         pass
 
+    # Resolve the button template once for the whole page.
+    format_button_text = i18n_instance.get_formatter(
+        lang, "admin_banned_user_button_text")
     for user_row in banned_users:
-
-        user_display_parts = []
-        if user_row.first_name:
-            user_display_parts.append(user_row.first_name)
+        first_name = user_row.first_name
         if user_row.username:
-            user_display_parts.append(f"(@{user_row.username})")
-        if not user_display_parts:
-            user_display_parts.append(f"ID: {user_row.user_id}")
+            user_display = (f"{first_name} (@{user_row.username})"
+                            if first_name else f"(@{user_row.username})")
+        else:
+            user_display = first_name or f"ID: {user_row.user_id}"
 
-        user_display = " ".join(user_display_parts).strip()
-
-        button_text = _("admin_banned_user_button_text",
-                        user_display=user_display,
-                        user_id=user_row.user_id)
+        button_text = format_button_text(user_display=user_display,
+                                         user_id=user_row.user_id)
         builder.row(
             InlineKeyboardButton(
                 text=button_text,
-                callback_data=
-                f"admin_user_card:{user_row.user_id}:{current_page}"))
+                callback_data=_USER_CARD_CALLBACK %
+                (user_row.user_id, current_page)))
 
     if total_banned > page_size:
-        total_pages = math.ceil(total_banned / page_size)
+        total_pages = -(-total_banned // page_size)
         pagination_buttons = []
         if current_page > 0:
             pagination_buttons.append(
                 InlineKeyboardButton(
                     text=_("prev_page_button"),
-                    callback_data=f"admin_action:view_banned:{current_page - 1}"
+                    callback_data=_VIEW_BANNED_CALLBACK % (current_page - 1)
                 ))
         pagination_buttons.append(
             InlineKeyboardButton(text=f"{current_page + 1}/{total_pages}",
@@ -131,7 +142,7 @@ def get_banned_users_keyboard(banned_users: List[User], current_page: int,
             pagination_buttons.append(
                 InlineKeyboardButton(
                     text=_("next_page_button"),
-                    callback_data=f"admin_action:view_banned:{current_page + 1}"
+                    callback_data=_VIEW_BANNED_CALLBACK % (current_page + 1)
                 ))
         if pagination_buttons:
             builder.row(*pagination_buttons)
@@ -147,7 +158,7 @@ def get_user_card_keyboard(user_id: int,
                            i18n_instance,
                            lang: str,
                            banned_list_page: int = 0) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
+    _ = bind_gettext(i18n_instance, lang)
     builder = InlineKeyboardBuilder()
     if is_banned:
         builder.button(
@@ -169,35 +180,45 @@ def get_user_card_keyboard(user_id: int,
 def get_confirmation_keyboard(yes_callback_data: str, no_callback_data: str,
                               i18n_instance,
                               lang: str) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
+    _ = bind_gettext(i18n_instance, lang)
     builder = InlineKeyboardBuilder()
     builder.button(text=_(key="yes_button"), callback_data=yes_callback_data)
     builder.button(text=_(key="no_button"), callback_data=no_callback_data)
     return builder.as_markup()
 
 
+@functools.lru_cache(maxsize=32)
 def get_broadcast_confirmation_keyboard(lang: str,
                                         i18n_instance) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
-    builder = InlineKeyboardBuilder()
-    builder.button(text=_(key="confirm_broadcast_send_button"),
-                   callback_data="broadcast_final_action:send")
-    builder.button(text=_(key="cancel_broadcast_button"),
-                   callback_data="broadcast_final_action:cancel")
-    builder.adjust(2)
-    return builder.as_markup()
+    _ = bind_gettext(i18n_instance, lang)
+    return InlineKeyboardMarkup(inline_keyboard=[[
+        InlineKeyboardButton(text=_(key="confirm_broadcast_send_button"),
+                             callback_data="broadcast_final_action:send"),
+        InlineKeyboardButton(text=_(key="cancel_broadcast_button"),
+                             callback_data="broadcast_final_action:cancel"),
+    ]])
 
 
+@functools.lru_cache(maxsize=32)
 def get_back_to_admin_panel_keyboard(lang: str,
                                      i18n_instance) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
-    builder = InlineKeyboardBuilder()
-    builder.button(text=_(key="back_to_admin_panel_button"),
-                   callback_data="admin_action:main")
-    return builder.as_markup()
+    _ = bind_gettext(i18n_instance, lang)
+    return InlineKeyboardMarkup(inline_keyboard=[[
+        InlineKeyboardButton(text=_(key="back_to_admin_panel_button"),
+                             callback_data="admin_action:main")
+    ]])
+
+
+def precompute_admin_keyboards(i18n_instance) -> None:
+    for lang in i18n_instance.locales_data:
+        _build_admin_panel_keyboard(i18n_instance, lang)
+        get_logs_menu_keyboard(i18n_instance, lang)
+        get_broadcast_confirmation_keyboard(lang, i18n_instance)
+        get_back_to_admin_panel_keyboard(lang, i18n_instance)
+
 
 def get_payment_confirmation_admin_keyboard(lang: str, i18n_instance, user_id: int) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
+    _ = bind_gettext(i18n_instance, lang)
     builder = InlineKeyboardBuilder()
     
     builder.button(text=_("admin_extend_30_days"), 
@@ -1,117 +1,161 @@
-from aiogram.utils.keyboard import InlineKeyboardBuilder, InlineKeyboardButton
-from aiogram.types import InlineKeyboardMarkup, WebAppInfo
-from typing import Dict, Optional, List
+import functools
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, WebAppInfo
+from typing import Any, Dict, Optional, List, Tuple
 
 from config.settings import Settings
+from bot.middlewares.i18n import bind_gettext
 
 
 def get_main_menu_inline_keyboard(
     lang: str, i18n_instance, settings: Settings, show_trial_button: bool = False
 ) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
-    builder = InlineKeyboardBuilder()
+    return _build_main_menu_inline_keyboard(
+        lang,
+        i18n_instance,
+        show_trial_button and settings.TRIAL_ENABLED,
+        settings.SUBSCRIPTION_MINI_APP_URL,
+        settings.SERVER_STATUS_URL,
+        settings.SUPPORT_LINK,
+        settings.TERMS_OF_SERVICE_URL,
+    )
 
-    if show_trial_button and settings.TRIAL_ENABLED:
-        builder.row(
-            InlineKeyboardButton(
-                text=_(key="menu_activate_trial_button"),
-                callback_data="main_action:request_trial",
-            )
+
+@functools.lru_cache(maxsize=32)
+def _build_main_menu_inline_keyboard(
+    lang: str,
+    i18n_instance,
+    show_trial_button: bool,
+    mini_app_url: Optional[str],
+    server_status_url: Optional[str],
+    support_link: Optional[str],
+    terms_of_service_url: Optional[str],
+) -> InlineKeyboardMarkup:
+    _ = bind_gettext(i18n_instance, lang)
+    rows: List[List[InlineKeyboardButton]] = []
+
+    if show_trial_button:
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text=_("menu_activate_trial_button"),
+                    callback_data="main_action:request_trial",
+                )
+            ]
         )
 
-    if settings.SUBSCRIPTION_MINI_APP_URL:
-        builder.row(
-            InlineKeyboardButton(
-                text=_(key="menu_connect_button"),
-                web_app=WebAppInfo(url=settings.SUBSCRIPTION_MINI_APP_URL),
-            )
+    if mini_app_url:
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text=_("menu_connect_button"),
+                    web_app=WebAppInfo(url=mini_app_url),
+                )
+            ]
         )
     else:
-        builder.row(
-            InlineKeyboardButton(
-                text=_(key="menu_subscribe_inline"),
-                callback_data="main_action:subscribe",
-            )
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text=_("menu_subscribe_inline"),
+                    callback_data="main_action:subscribe",
+                )
+            ]
         )
 
-    builder.row(
-        InlineKeyboardButton(
-            text=_(key="menu_my_subscription_inline"),
-            callback_data="main_action:my_subscription",
-        )
+    rows.append(
+        [
+            InlineKeyboardButton(
+                text=_("menu_my_subscription_inline"),
+                callback_data="main_action:my_subscription",
+            )
+        ]
     )
 
     promo_button = InlineKeyboardButton(
-        text=_(key="menu_apply_promo_button"), callback_data="main_action:apply_promo"
+        text=_("menu_apply_promo_button"), callback_data="main_action:apply_promo"
     )
-    builder.row(promo_button)
+    rows.append([promo_button])
 
-    language_button = InlineKeyboardButton(
-        text=_(key="menu_language_settings_inline"),
-        callback_data="main_action:language",
-    )
-    status_button_list = []
-    if settings.SERVER_STATUS_URL:
-        status_button_list.append(
+    language_row = [
+        InlineKeyboardButton(
+            text=_("menu_language_settings_inline"),
+            callback_data="main_action:language",
+        )
+    ]
+    if server_status_url:
+        language_row.append(
             InlineKeyboardButton(
-                text=_(key="menu_server_status_button"), url=settings.SERVER_STATUS_URL
+                text=_("menu_server_status_button"), url=server_status_url
             )
         )
+    rows.append(language_row)
 
-    if status_button_list:
-        builder.row(language_button, *status_button_list)
-    else:
-        builder.row(language_button)
-
-    if settings.SUPPORT_LINK:
-        builder.row(
-            InlineKeyboardButton(
-                text=_(key="menu_support_button"), url=settings.SUPPORT_LINK
-            )
+    if support_link:
+        rows.append(
+            [InlineKeyboardButton(text=_("menu_support_button"), url=support_link)]
         )
 
-    if settings.TERMS_OF_SERVICE_URL:
-        builder.row(
-            InlineKeyboardButton(
-                text=_(key="menu_terms_button"), url=settings.TERMS_OF_SERVICE_URL
-            )
+    if terms_of_service_url:
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text=_("menu_terms_button"), url=terms_of_service_url
+                )
+            ]
         )
 
-    return builder.as_markup()
+    return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
+@functools.lru_cache(maxsize=16)
 def get_language_selection_keyboard(
     i18n_instance, current_lang: str
 ) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(current_lang, key, **kwargs)
-    builder = InlineKeyboardBuilder()
-    builder.button(
-        text=f"🇬🇧 English {'✅' if current_lang == 'en' else ''}",
-        callback_data="set_lang_en",
-    )
-    builder.button(
-        text=f"🇷🇺 Русский {'✅' if current_lang == 'ru' else ''}",
-        callback_data="set_lang_ru",
-    )
-    builder.button(
-        text=_(key="back_to_main_menu_button"), callback_data="main_action:back_to_main"
+    _ = bind_gettext(i18n_instance, current_lang)
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=f"🇬🇧 English {'✅' if current_lang == 'en' else ''}",
+                    callback_data="set_lang_en",
+                )
+            ],
+            [
+                InlineKeyboardButton(
+                    text=f"🇷🇺 Русский {'✅' if current_lang == 'ru' else ''}",
+                    callback_data="set_lang_ru",
+                )
+            ],
+            [
+                InlineKeyboardButton(
+                    text=_("back_to_main_menu_button"),
+                    callback_data="main_action:back_to_main",
+                )
+            ],
+        ]
     )
-    builder.adjust(1)
-    return builder.as_markup()
 
 
+@functools.lru_cache(maxsize=16)
 def get_trial_confirmation_keyboard(lang: str, i18n_instance) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
-    builder = InlineKeyboardBuilder()
-    builder.button(
-        text=_(key="trial_confirm_activate_button"),
-        callback_data="trial_action:confirm_activate",
-    )
-    builder.button(
-        text=_(key="cancel_button"), callback_data="main_action:back_to_main"
+    _ = bind_gettext(i18n_instance, lang)
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=_("trial_confirm_activate_button"),
+                    callback_data="trial_action:confirm_activate",
+                )
+            ],
+            [
+                InlineKeyboardButton(
+                    text=_("cancel_button"),
+                    callback_data="main_action:back_to_main",
+                )
+            ],
+        ]
     )
-    builder.adjust(1)
-    return builder.as_markup()
 
 
 def get_subscription_options_keyboard(
@@ -119,29 +163,51 @@ def get_subscription_options_keyboard(
     currency_symbol_val: str,
     lang: str,
     i18n_instance,
+    options_key: Optional[Tuple[Tuple[int, Any], ...]] = None,
 ) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
-    builder = InlineKeyboardBuilder()
-    if subscription_options:
-        for months, price in subscription_options.items():
-            if price is not None:
-                button_text = _(
-                    "subscribe_for_months_button",
-                    months=months,
-                    price=price,
-                    currency_symbol=currency_symbol_val,
-                )
-                builder.button(
-                    text=button_text, callback_data=f"subscribe_period:{months}"
-                )
-        builder.adjust(1)
-    builder.row(
-        InlineKeyboardButton(
-            text=_(key="back_to_main_menu_button"),
-            callback_data="main_action:back_to_main",
+    if options_key is None:
+        options_key = (
+            tuple(subscription_options.items()) if subscription_options else ()
         )
+    return _build_subscription_options_keyboard(
+        options_key, currency_symbol_val, lang, i18n_instance
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _build_subscription_options_keyboard(
+    options_key: Tuple[Tuple[int, Any], ...],
+    currency_symbol_val: str,
+    lang: str,
+    i18n_instance,
+) -> InlineKeyboardMarkup:
+    _ = bind_gettext(i18n_instance, lang)
+    rows: List[List[InlineKeyboardButton]] = []
+    for months, price in options_key:
+        if price is not None:
+            button_text = _(
+                "subscribe_for_months_button",
+                months=months,
+                price=price,
+                currency_symbol=currency_symbol_val,
+            )
+            rows.append(
+                [
+                    InlineKeyboardButton(
+                        text=button_text,
+                        callback_data=f"subscribe_period:{months}",
+                    )
+                ]
+            )
+    rows.append(
+        [
+            InlineKeyboardButton(
+                text=_("back_to_main_menu_button"),
+                callback_data="main_action:back_to_main",
+            )
+        ]
     )
-    return builder.as_markup()
+    return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
 def get_payment_method_keyboard(
@@ -154,116 +220,212 @@ def get_payment_method_keyboard(
     i18n_instance,
     settings: Settings,
 ) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
-    builder = InlineKeyboardBuilder()
-    if settings.STARS_ENABLED and stars_price is not None:
-        builder.button(
-            text=_("pay_with_stars_button"),
-            callback_data=f"pay_stars:{months}:{stars_price}",
+    return _build_payment_method_keyboard(
+        months,
+        price,
+        tribute_url,
+        stars_price,
+        lang,
+        i18n_instance,
+        settings.STARS_ENABLED,
+        settings.TRIBUTE_ENABLED,
+        settings.YOOKASSA_ENABLED,
+        settings.CRYPTOPAY_ENABLED,
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _build_payment_method_keyboard(
+    months: int,
+    price: float,
+    tribute_url: Optional[str],
+    stars_price: Optional[int],
+    lang: str,
+    i18n_instance,
+    stars_enabled: bool,
+    tribute_enabled: bool,
+    yookassa_enabled: bool,
+    cryptopay_enabled: bool,
+) -> InlineKeyboardMarkup:
+    _ = bind_gettext(i18n_instance, lang)
+    rows: List[List[InlineKeyboardButton]] = []
+    if stars_enabled and stars_price is not None:
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text=_("pay_with_stars_button"),
+                    callback_data=f"pay_stars:{months}:{stars_price}",
+                )
+            ]
         )
-    if settings.TRIBUTE_ENABLED and tribute_url:
-        builder.button(text=_("pay_with_tribute_button"), url=tribute_url)
-    if settings.YOOKASSA_ENABLED:
-        builder.button(
-            text=_("pay_with_yookassa_button"), callback_data=f"pay_yk:{months}:{price}"
+    if tribute_enabled and tribute_url:
+        rows.append(
+            [InlineKeyboardButton(text=_("pay_with_tribute_button"), url=tribute_url)]
         )
-    if settings.CRYPTOPAY_ENABLED:
-        builder.button(
-            text=_("pay_with_cryptopay_button"),
-            callback_data=f"pay_crypto:{months}:{price}",
+    if yookassa_enabled:
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text=_("pay_with_yookassa_button"),
+                    callback_data=f"pay_yk:{months}:{price}",
+                )
+            ]
+        )
+    if cryptopay_enabled:
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text=_("pay_with_cryptopay_button"),
+                    callback_data=f"pay_crypto:{months}:{price}",
+                )
+            ]
         )
-    builder.button(text=_(key="cancel_button"), callback_data="main_action:subscribe")
-    builder.adjust(1)
-    return builder.as_markup()
+    rows.append(
+        [
+            InlineKeyboardButton(
+                text=_("cancel_button"), callback_data="main_action:subscribe"
+            )
+        ]
+    )
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+def precompute_subscription_keyboards(settings: Settings, i18n_instance) -> None:
+    subscription_options = settings.subscription_options
+    currency_symbol_val = settings.DEFAULT_CURRENCY_SYMBOL
+    for lang in i18n_instance.locales_data:
+        get_back_to_main_menu_markup(lang, i18n_instance)
+        get_main_menu_inline_keyboard(lang, i18n_instance, settings, False)
+        get_main_menu_inline_keyboard(lang, i18n_instance, settings, True)
+        get_subscription_not_active_keyboard(lang, i18n_instance)
+        get_subscribe_only_markup(lang, i18n_instance)
+        get_language_selection_keyboard(i18n_instance, lang)
+        get_trial_confirmation_keyboard(lang, i18n_instance)
+        get_user_banned_keyboard(settings.SUPPORT_LINK, lang, i18n_instance)
+        get_subscription_options_keyboard(
+            subscription_options,
+            currency_symbol_val,
+            lang,
+            i18n_instance,
+            settings.subscription_options_key,
+        )
+        for months, pricing in settings.pricing.items():
+            get_payment_method_keyboard(
+                months,
+                pricing.rub,
+                pricing.tribute_url,
+                pricing.stars,
+                currency_symbol_val,
+                lang,
+                i18n_instance,
+                settings,
+            )
 
 
 def get_payment_url_keyboard(
     payment_url: str, lang: str, i18n_instance
 ) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
-    builder = InlineKeyboardBuilder()
-    builder.button(text=_(key="pay_button"), url=payment_url)
-    builder.button(
-        text=_(key="back_to_main_menu_button"), callback_data="main_action:back_to_main"
+    _ = bind_gettext(i18n_instance, lang)
+    pay_button = InlineKeyboardButton(text=_("pay_button"), url=payment_url)
+    back_markup = get_back_to_main_menu_markup(lang, i18n_instance)
+    return InlineKeyboardMarkup(
+        inline_keyboard=[[pay_button], *back_markup.inline_keyboard]
     )
-    builder.adjust(1)
-    return builder.as_markup()
 
 
 def get_referral_link_keyboard(lang: str, i18n_instance) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
-    builder = InlineKeyboardBuilder()
-    builder.button(
-        text=_(key="back_to_main_menu_button"), callback_data="main_action:back_to_main"
-    )
-    return builder.as_markup()
+    return get_back_to_main_menu_markup(lang, i18n_instance)
 
 
+@functools.lru_cache(maxsize=16)
 def get_back_to_main_menu_markup(lang: str, i18n_instance) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
-    builder = InlineKeyboardBuilder()
-    builder.button(
-        text=_(key="back_to_main_menu_button"), callback_data="main_action:back_to_main"
+    _ = bind_gettext(i18n_instance, lang)
+    back_button = InlineKeyboardButton(
+        text=_("back_to_main_menu_button"), callback_data="main_action:back_to_main"
+    )
+    return InlineKeyboardMarkup(inline_keyboard=[[back_button]])
+
+
+@functools.lru_cache(maxsize=16)
+def get_subscription_not_active_keyboard(
+    lang: str, i18n_instance
+) -> InlineKeyboardMarkup:
+    _ = bind_gettext(i18n_instance, lang)
+    buy_button = InlineKeyboardButton(
+        text=_("menu_subscribe_inline", default="Купить"),
+        callback_data="main_action:subscribe",
+    )
+    back_markup = get_back_to_main_menu_markup(lang, i18n_instance)
+    return InlineKeyboardMarkup(
+        inline_keyboard=[[buy_button], *back_markup.inline_keyboard]
     )
-    return builder.as_markup()
 
 
+@functools.lru_cache(maxsize=16)
+def get_subscription_details_keyboard(
+    lang: str, i18n_instance, mini_app_url: Optional[str]
+) -> InlineKeyboardMarkup:
+    _ = bind_gettext(i18n_instance, lang)
+    back_markup = get_back_to_main_menu_markup(lang, i18n_instance)
+    if not mini_app_url:
+        return back_markup
+    connect_button = InlineKeyboardButton(
+        text=_("connect_button"), web_app=WebAppInfo(url=mini_app_url)
+    )
+    return InlineKeyboardMarkup(
+        inline_keyboard=[[connect_button], *back_markup.inline_keyboard]
+    )
+
+
+@functools.lru_cache(maxsize=16)
 def get_subscribe_only_markup(lang: str, i18n_instance) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
-    builder = InlineKeyboardBuilder()
-    builder.button(
-        text=_(key="menu_subscribe_inline"), callback_data="main_action:subscribe"
+    _ = bind_gettext(i18n_instance, lang)
+    subscribe_button = InlineKeyboardButton(
+        text=_("menu_subscribe_inline"), callback_data="main_action:subscribe"
     )
-    return builder.as_markup()
+    return InlineKeyboardMarkup(inline_keyboard=[[subscribe_button]])
 
 
+@functools.lru_cache(maxsize=16)
 def get_user_banned_keyboard(
     support_link: Optional[str], lang: str, i18n_instance
 ) -> Optional[InlineKeyboardMarkup]:
     if not support_link:
         return None
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
-    builder = InlineKeyboardBuilder()
-    builder.button(text=_(key="menu_support_button"), url=support_link)
-    return builder.as_markup()
+    _ = bind_gettext(i18n_instance, lang)
+    support_button = InlineKeyboardButton(
+        text=_("menu_support_button"), url=support_link
+    )
+    return InlineKeyboardMarkup(inline_keyboard=[[support_button]])
 
 
 def get_connect_and_main_keyboard(
     lang: str, i18n_instance, settings: Settings, config_link: Optional[str]
 ) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
-    builder = InlineKeyboardBuilder()
+    _ = bind_gettext(i18n_instance, lang)
 
     if settings.SUBSCRIPTION_MINI_APP_URL:
-        builder.row(
-            InlineKeyboardButton(
-                text=_(key="menu_connect_button"),
-                web_app=WebAppInfo(url=settings.SUBSCRIPTION_MINI_APP_URL),
-            )
+        connect_button = InlineKeyboardButton(
+            text=_("menu_connect_button"),
+            web_app=WebAppInfo(url=settings.SUBSCRIPTION_MINI_APP_URL),
         )
     else:
-        builder.row(
-            InlineKeyboardButton(
-                text=_("connect_button"),
-                callback_data="main_action:my_subscription",
-            )
+        connect_button = InlineKeyboardButton(
+            text=_("connect_button"),
+            callback_data="main_action:my_subscription",
         )
 
-    builder.row(
-        InlineKeyboardButton(
-            text=_("back_to_main_menu_button"),
-            callback_data="main_action:back_to_main",
-        )
+    back_markup = get_back_to_main_menu_markup(lang, i18n_instance)
+    return InlineKeyboardMarkup(
+        inline_keyboard=[[connect_button], *back_markup.inline_keyboard]
     )
 
-    return builder.as_markup()
-
 
+@functools.lru_cache(maxsize=16)
 def get_payment_confirmation_markup(lang: str, i18n_instance) -> InlineKeyboardMarkup:
-    _ = lambda key, **kwargs: i18n_instance.gettext(lang, key, **kwargs)
-    builder = InlineKeyboardBuilder()
-    builder.button(
-        text=_(key="payment_confirmation_button"),
+    _ = bind_gettext(i18n_instance, lang)
+    confirm_button = InlineKeyboardButton(
+        text=_("payment_confirmation_button"),
         callback_data="payment_action:confirm_paid",
     )
-    return builder.as_markup()
+    return InlineKeyboardMarkup(inline_keyboard=[[confirm_button]])
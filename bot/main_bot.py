@@ -1,5 +1,6 @@
 import logging
 import asyncio
+import orjson
 from typing import Callable, Dict, Any, Awaitable, Optional
 
 from aiogram import Bot, Dispatcher, BaseMiddleware, Router, F
@@ -15,6 +16,7 @@ from aiogram.types import (
 from aiogram.enums import ParseMode
 from aiogram.filters import CommandStart, Command
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
 from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiohttp import web
@@ -28,6 +30,11 @@ from db.database_setup import init_db_connection
 from bot.middlewares.i18n import I18nMiddleware, get_i18n_instance, JsonI18n
 from bot.middlewares.ban_check_middleware import BanCheckMiddleware
 from bot.middlewares.action_logger_middleware import ActionLoggerMiddleware
+from bot.middlewares.outgoing_rate_limit_middleware import OutgoingRateLimitMiddleware
+
+from bot.keyboards.inline.user_keyboards import precompute_subscription_keyboards
+from bot.keyboards.inline.admin_keyboards import precompute_admin_keyboards
+from bot.handlers.user.subscription import precompute_payment_descriptions
 
 from bot.handlers.user import user_router_aggregate
 from bot.handlers.admin import admin_router_aggregate
@@ -45,6 +52,10 @@ from bot.services.crypto_pay_service import CryptoPayService, cryptopay_webhook_
 from bot.handlers.user import payment as user_payment_webhook_module
 
 
+def _orjson_dumps(obj: Any) -> str:
+    return orjson.dumps(obj).decode()
+
+
 class DBSessionMiddleware(BaseMiddleware):
 
     def __init__(self, async_session_factory: sessionmaker):
@@ -273,7 +284,11 @@ async def run_bot(
 ):
     storage = MemoryStorage()
     default_props = DefaultBotProperties(parse_mode=ParseMode.HTML)
-    bot = Bot(token=settings_param.BOT_TOKEN, default=default_props)
+    bot_session = AiohttpSession(json_loads=orjson.loads, json_dumps=_orjson_dumps)
+    bot = Bot(
+        token=settings_param.BOT_TOKEN, default=default_props, session=bot_session
+    )
+    bot.session.middleware(OutgoingRateLimitMiddleware())
 
     local_async_session_factory = init_db_connection(settings_param)
     if local_async_session_factory is None:
@@ -297,6 +312,9 @@ async def run_bot(
     i18n_instance = get_i18n_instance(
         path="locales", default=settings_param.DEFAULT_LANGUAGE
     )
+    precompute_subscription_keyboards(settings_param, i18n_instance)
+    precompute_payment_descriptions(settings_param, i18n_instance)
+    precompute_admin_keyboards(i18n_instance)
 
     yookassa_service = YooKassaService(
         shop_id=settings_param.YOOKASSA_SHOP_ID,
@@ -343,6 +361,7 @@ async def run_bot(
         settings_param,
         i18n_instance,
         local_async_session_factory,
+        subscription_service,
     )
 
     dp["i18n_instance"] = i18n_instance
@@ -9,7 +9,7 @@ from aiogram.exceptions import TelegramAPIError, TelegramForbiddenError, Telegra
 from config.settings import Settings
 from db.dal import user_dal
 
-from .i18n import JsonI18n
+from .i18n import JsonI18n, I18nContext
 from ..keyboards.inline.user_keyboards import get_user_banned_keyboard
 
 
@@ -47,11 +47,11 @@ class BanCheckMiddleware(BaseMiddleware):
                 f"User {event_user.id} ({event_user.username or 'NoUsername'}) is banned. Blocking access."
             )
 
-            i18n_data_from_event = data.get("i18n_data", {})
-            current_lang = i18n_data_from_event.get(
-                "current_language", self.settings.DEFAULT_LANGUAGE)
-            i18n_to_use: Optional[JsonI18n] = i18n_data_from_event.get(
-                "i18n_instance", self.i18n_main_instance)
+            i18n_ctx: Optional[I18nContext] = data.get("i18n_data")
+            current_lang = (i18n_ctx.lang if i18n_ctx else
+                            self.settings.DEFAULT_LANGUAGE)
+            i18n_to_use: Optional[JsonI18n] = (i18n_ctx.i18n if i18n_ctx else
+                                               self.i18n_main_instance)
 
             ban_message_text = "You are banned. Please contact support."
             keyboard: Optional[InlineKeyboardMarkup] = None
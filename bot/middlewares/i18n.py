@@ -1,6 +1,8 @@
 import logging
 import json
 import os
+import functools
+from dataclasses import dataclass, field
 from typing import Any, Awaitable, Callable, Dict, Optional
 
 from aiogram import BaseMiddleware
@@ -18,12 +20,17 @@ class JsonI18n:
         self.path = path
         self.default_lang = default
         self.locales_data: Dict[str, Dict[str, str]] = {}
+        self._lookup = functools.lru_cache(maxsize=4096)(self._lookup_impl)
+        self._cached_formatter = functools.lru_cache(maxsize=256)(
+            self._formatter_impl)
         self._load_locales()
         logging.info(
             f"JsonI18n initialized. Loaded languages: {list(self.locales_data.keys())}. Default: {self.default_lang}"
         )
 
     def _load_locales(self):
+        self._lookup.cache_clear()
+        self._cached_formatter.cache_clear()
         if not os.path.isdir(self.path):
             logging.error(
                 f"Locales path not found or not a directory: {self.path}")
@@ -45,14 +52,45 @@ class JsonI18n:
                         exc_info=True)
 
     def gettext(self, lang_code: Optional[str], key: str, **kwargs) -> str:
-        effective_lang_code = lang_code if lang_code and lang_code in self.locales_data else self.default_lang
+        if not kwargs:
+            return self._lookup(lang_code, key)
+        # Only the template lookup is cached; rendered strings carry per-user
+        # values and are formatted on every call.
+        return self._cached_formatter(lang_code, key)(**kwargs)
+
+    def get_formatter(self, lang_code: Optional[str],
+                      key: str) -> Callable[..., str]:
+        """Return a ``format(**kwargs)`` callable for a resolved template."""
+        return self._cached_formatter(lang_code, key)
+
+    def _formatter_impl(self, lang_code: Optional[str],
+                        key: str) -> Callable[..., str]:
+        format_template = self._lookup(lang_code, key).format
+
+        def format_text(**kwargs) -> str:
+            try:
+                return format_template(**kwargs)
+            except Exception:
+                # Let gettext log the formatting problem and apply its
+                # fallbacks.
+                return self._gettext(lang_code, key, **kwargs)
+
+        return format_text
+
+    def _effective_lang(self, lang_code: Optional[str]) -> str:
+        return lang_code if lang_code and lang_code in self.locales_data else self.default_lang
+
+    def _lookup_impl(self, lang_code: Optional[str], key: str) -> str:
+        """Resolve the raw template for ``key``, falling back to the default
+        language and finally to the key itself."""
+        effective_lang_code = self._effective_lang(lang_code)
 
         lang_data = self.locales_data.get(effective_lang_code)
         if lang_data is None:
             logging.warning(
                 f"No language data for '{effective_lang_code}' (default '{self.default_lang}' also missing). Key '{key}' will be returned as is."
             )
-            return key.format(**kwargs) if kwargs else key
+            return key
 
         text = lang_data.get(key)
         if text is None:
@@ -65,21 +103,48 @@ class JsonI18n:
                 logging.warning(
                     f"Translation key '{key}' not found for lang '{effective_lang_code}' or default '{self.default_lang}'. Returning key."
                 )
-                return key.format(**kwargs) if kwargs else key
+                return key
+        return text
+
+    def _gettext(self, lang_code: Optional[str], key: str, **kwargs) -> str:
+        text = self._lookup(lang_code, key)
+        if not kwargs:
+            return text
         try:
-            return text.format(**kwargs) if kwargs else text
+            return text.format(**kwargs)
         except KeyError as e_format:
             logging.warning(
-                f"Missing format key '{e_format}' for i18n key '{key}' (lang: {effective_lang_code}). Original text: '{text}'"
+                f"Missing format key '{e_format}' for i18n key '{key}' (lang: {self._effective_lang(lang_code)}). Original text: '{text}'"
             )
             return text
         except Exception as e_general_format:
             logging.error(
-                f"General error formatting i18n key '{key}' (lang: {effective_lang_code}): {e_general_format}. Original text: '{text}'",
+                f"General error formatting i18n key '{key}' (lang: {self._effective_lang(lang_code)}): {e_general_format}. Original text: '{text}'",
                 exc_info=True)
             return text
 
 
+def bind_gettext(i18n: JsonI18n, lang: str) -> Callable[..., str]:
+    """Return ``gettext`` with the language pre-bound: ``get_text(key, **kwargs)``."""
+    return functools.partial(i18n.gettext, lang)
+
+
+@dataclass(slots=True)
+class I18nContext:
+    """Per-update translation context injected into handlers as ``i18n_data``."""
+
+    i18n: JsonI18n
+    lang: str
+    get_text: Callable[..., str] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.get_text = bind_gettext(self.i18n, self.lang)
+
+    def set_language(self, lang: str) -> None:
+        self.lang = lang
+        self.get_text = bind_gettext(self.i18n, lang)
+
+
 _i18n_instance_singleton: Optional[JsonI18n] = None
 
 
@@ -146,8 +211,6 @@ class I18nMiddleware(BaseMiddleware):
                     ) in self.i18n.locales_data:
                         current_language = event_user.language_code.lower()
 
-        data["i18n_data"] = {
-            "i18n_instance": self.i18n,
-            "current_language": current_language
-        }
+        data["i18n_data"] = I18nContext(i18n=self.i18n,
+                                        lang=current_language)
         return await handler(event, data)
@@ -0,0 +1,40 @@
+import asyncio
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware, NextRequestMiddlewareType)
+from aiogram.methods import (CopyMessage, EditMessageReplyMarkup,
+                             EditMessageText, ForwardMessage, SendDocument,
+                             SendInvoice, SendMessage, SendPhoto)
+from aiogram.methods.base import Response, TelegramMethod, TelegramType
+
+# Methods that put a message into a chat and so count towards Telegram's
+# global ~30 messages per second limit.
+THROTTLED_METHODS = (SendMessage, EditMessageText, EditMessageReplyMarkup,
+                     CopyMessage, ForwardMessage, SendPhoto, SendDocument,
+                     SendInvoice)
+
+
+class OutgoingRateLimitMiddleware(BaseRequestMiddleware):
+    """Spaces outgoing message requests so the bot stays under the global
+    Telegram send limit instead of hitting 429 retry-after errors."""
+
+    def __init__(self, max_per_second: float = 30.0):
+        self._interval = 1.0 / max_per_second
+        self._next_slot = 0.0
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        if isinstance(method, THROTTLED_METHODS):
+            now = asyncio.get_running_loop().time()
+            # The slot is reserved synchronously, so concurrent handlers are
+            # queued in call order without needing a lock.
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+            if slot > now:
+                await asyncio.sleep(slot - now)
+        return await make_request(bot, method)
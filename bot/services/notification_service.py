@@ -22,12 +22,17 @@ async def notify_admins(
         return
     admin_lang = settings.DEFAULT_LANGUAGE
     msg = i18n.gettext(admin_lang, message_key, **kwargs)
-    for admin_id in settings.ADMIN_IDS:
+
+    async def send_to_admin(admin_id: int) -> None:
         try:
             await bot.send_message(admin_id, msg, parse_mode=parse_mode)
         except Exception as e:
             logging.error(f"Failed to send admin notification to {admin_id}: {e}")
 
+    # Each admin still gets their own send_message, but the sends run
+    # concurrently; the outgoing rate limiter still spaces them.
+    await asyncio.gather(*(send_to_admin(admin_id) for admin_id in settings.ADMIN_IDS))
+
 
 async def notify_admin_new_trial(
     bot: Bot, settings: Settings, i18n: JsonI18n, user_id: int, end_date: datetime
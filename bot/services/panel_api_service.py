@@ -25,7 +25,14 @@ class PanelApiService:
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
             timeout = aiohttp.ClientTimeout(total=30)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+            # Keep connections to the panel alive between requests so most
+            # calls skip the TCP/TLS handshake.
+            connector = aiohttp.TCPConnector(limit=100,
+                                             limit_per_host=50,
+                                             keepalive_timeout=60,
+                                             ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(timeout=timeout,
+                                                  connector=connector)
         return self._session
 
     async def close_session(self):
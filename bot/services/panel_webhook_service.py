@@ -1,4 +1,4 @@
-import json
+import orjson
 import logging
 import hmac
 import hashlib
@@ -10,6 +10,7 @@ from typing import Optional
 from config.settings import Settings
 from bot.middlewares.i18n import JsonI18n
 from bot.keyboards.inline.user_keyboards import get_payment_confirmation_markup
+from bot.services.subscription_service import SubscriptionService
 from db.dal import user_dal
 from datetime import datetime
 
@@ -20,11 +21,13 @@ EVENT_MAP = {
 }
 
 class PanelWebhookService:
-    def __init__(self, bot: Bot, settings: Settings, i18n: JsonI18n, async_session_factory: sessionmaker):
+    def __init__(self, bot: Bot, settings: Settings, i18n: JsonI18n, async_session_factory: sessionmaker,
+                 subscription_service: SubscriptionService):
         self.bot = bot
         self.settings = settings
         self.i18n = i18n
         self.async_session_factory = async_session_factory
+        self.subscription_service = subscription_service
 
     def _format_panel_date(self, date_str: str) -> str:
         if not date_str or len(date_str) < 10:
@@ -57,6 +60,8 @@ class PanelWebhookService:
             logging.warning("Panel webhook without telegramId received")
             return
         user_id = int(telegram_id)
+        # The panel status or expiry date just changed.
+        self.subscription_service.invalidate_active_subscription_cache(user_id)
 
         if not self.settings.SUBSCRIPTION_NOTIFICATIONS_ENABLED:
             return
@@ -111,7 +116,7 @@ class PanelWebhookService:
                 return web.Response(status=403, text="invalid_signature")
 
         try:
-            payload = json.loads(raw_body.decode())
+            payload = orjson.loads(raw_body)
         except Exception:
             return web.Response(status=400, text="bad_request")
 
@@ -145,6 +145,8 @@ class ReferralService:
                                         inviter_panel_sub_link_id)
                                     bonus_sub = await subscription_dal.upsert_subscription(
                                         session, bonus_sub_payload)
+                                    self.subscription_service.invalidate_active_subscription_cache(
+                                        inviter_user_id)
 
                                     panel_update_success = await self.subscription_service.panel_service.update_user_details_on_panel(
                                         inviter_panel_uuid, {
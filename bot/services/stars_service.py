@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Optional
 
@@ -9,10 +10,16 @@ from config.settings import Settings
 from db.dal import payment_dal, user_dal
 from .subscription_service import SubscriptionService
 from .referral_service import ReferralService
-from bot.middlewares.i18n import JsonI18n
+from bot.middlewares.i18n import JsonI18n, I18nContext
 from .notification_service import notify_admin_new_payment
 from bot.keyboards.inline.user_keyboards import get_connect_and_main_keyboard
 
+_STARS_PAYMENT_RECORD_DEFAULTS = {
+    "currency": "XTR",
+    "status": "pending_stars",
+    "provider": "telegram_stars",
+}
+
 
 class StarsService:
     def __init__(self, bot: Bot, settings: Settings, i18n: JsonI18n,
@@ -27,13 +34,11 @@ class StarsService:
     async def create_invoice(self, session: AsyncSession, user_id: int, months: int,
                              stars_price: int, description: str) -> Optional[int]:
         payment_record_data = {
+            **_STARS_PAYMENT_RECORD_DEFAULTS,
             "user_id": user_id,
             "amount": float(stars_price),
-            "currency": "XTR",
-            "status": "pending_stars",
             "description": description,
             "subscription_duration_months": months,
-            "provider": "telegram_stars",
         }
         try:
             db_payment_record = await payment_dal.create_payment_record(
@@ -68,7 +73,7 @@ class StarsService:
                                          payment_db_id: int,
                                          months: int,
                                          stars_amount: int,
-                                         i18n_data: dict) -> None:
+                                         i18n_data: I18nContext) -> None:
         try:
             await payment_dal.update_provider_payment_and_status(
                 session, payment_db_id,
@@ -104,9 +109,8 @@ class StarsService:
         if not final_end:
             final_end = activation_details["end_date"]
 
-        current_lang = i18n_data.get("current_language",
-                                     self.settings.DEFAULT_LANGUAGE)
-        i18n: JsonI18n = i18n_data.get("i18n_instance")
+        current_lang = i18n_data.lang
+        i18n: JsonI18n = i18n_data.i18n
         _ = lambda k, **kw: i18n.gettext(current_lang, k, **kw) if i18n else k
 
         config_link = activation_details.get("subscription_url") or _(
@@ -115,13 +119,12 @@ class StarsService:
 
         if applied_days:
             inviter_name_display = _("friend_placeholder")
-            db_user = await user_dal.get_user_by_id(session, message.from_user.id)
-            if db_user and db_user.referred_by_id:
-                inviter = await user_dal.get_user_by_id(session, db_user.referred_by_id)
-                if inviter and inviter.first_name:
-                    inviter_name_display = inviter.first_name
-                elif inviter and inviter.username:
-                    inviter_name_display = f"@{inviter.username}"
+            _db_user, inviter = await user_dal.get_user_with_inviter(
+                session, message.from_user.id)
+            if inviter and inviter.first_name:
+                inviter_name_display = inviter.first_name
+            elif inviter and inviter.username:
+                inviter_name_display = f"@{inviter.username}"
             success_msg = _(
                 "payment_successful_with_referral_bonus_full",
                 months=months,
@@ -141,25 +144,30 @@ class StarsService:
         markup = get_connect_and_main_keyboard(
             current_lang, i18n, self.settings, config_link
         )
-        try:
-            await self.bot.send_message(
+        # The user confirmation and the admin notification are independent
+        # Bot API calls, so they are sent concurrently.
+        send_result, notify_result = await asyncio.gather(
+            self.bot.send_message(
                 message.from_user.id,
                 success_msg,
                 reply_markup=markup,
                 parse_mode="HTML",
                 disable_web_page_preview=True,
-            )
-        except Exception as e_send:
-            logging.error(
-                f"Failed to send stars payment success message: {e_send}")
-
-        await notify_admin_new_payment(
-            self.bot,
-            self.settings,
-            self.i18n,
-            message.from_user.id,
-            months,
-            float(stars_amount),
-            currency="XTR",
+            ),
+            notify_admin_new_payment(
+                self.bot,
+                self.settings,
+                self.i18n,
+                message.from_user.id,
+                months,
+                float(stars_amount),
+                currency="XTR",
+            ),
+            return_exceptions=True,
         )
+        if isinstance(send_result, Exception):
+            logging.error(
+                f"Failed to send stars payment success message: {send_result}")
+        if isinstance(notify_result, Exception):
+            raise notify_result
 
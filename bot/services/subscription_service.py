@@ -1,7 +1,10 @@
+import asyncio
 import logging
+import time
+from dataclasses import dataclass
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Set, Tuple
 from aiogram import Bot
 from bot.middlewares.i18n import JsonI18n
 
@@ -11,6 +14,21 @@ from db.models import User, Subscription
 from config.settings import Settings
 from .panel_api_service import PanelApiService
 
+ACTIVE_DETAILS_CACHE_TTL_SECONDS = 30.0
+ACTIVE_DETAILS_CACHE_MAX_SIZE = 100000
+SUBSCRIPTION_HISTORY_CACHE_MAX_SIZE = 100000
+
+
+@dataclass(slots=True, frozen=True)
+class ActiveSubscriptionDetails:
+    end_date: Optional[datetime]
+    status_from_panel: str
+    config_link: Optional[str]
+    traffic_limit_bytes: Optional[int]
+    traffic_used_bytes: Optional[int]
+    user_bot_username: Optional[str]
+    is_panel_data: bool = True
+
 
 class SubscriptionService:
 
@@ -25,6 +43,17 @@ class SubscriptionService:
         self.panel_service = panel_service
         self.bot = bot
         self.i18n = i18n
+        # user_id -> (expires_at, details) for get_active_subscription_details
+        self._active_details_cache: Dict[
+            int, Tuple[float, Optional[ActiveSubscriptionDetails]]
+        ] = {}
+
+        # Users known to have had a subscription. Subscription rows are never
+        # deleted, so a positive answer cannot go stale and needs no TTL.
+        self._users_with_subscription_history: Set[int] = set()
+
+    def invalidate_active_subscription_cache(self, user_id: int) -> None:
+        self._active_details_cache.pop(user_id, None)
 
     async def get_user_language(self, session: AsyncSession, user_id: int) -> str:
         user_record = await user_dal.get_user_by_id(session, user_id)
@@ -37,8 +66,15 @@ class SubscriptionService:
     async def has_had_any_subscription(
         self, session: AsyncSession, user_id: int
     ) -> bool:
-
-        return await subscription_dal.has_any_subscription_for_user(session, user_id)
+        known = self._users_with_subscription_history
+        if user_id in known:
+            return True
+        if not await subscription_dal.has_any_subscription_for_user(session, user_id):
+            return False
+        if len(known) >= SUBSCRIPTION_HISTORY_CACHE_MAX_SIZE:
+            known.pop()
+        known.add(user_id)
+        return True
 
     async def _notify_admin_panel_user_creation_failed(self, user_id: int):
         if not self.bot or not self.i18n or not self.settings.ADMIN_IDS:
@@ -377,6 +413,7 @@ class SubscriptionService:
             }
 
         await session.commit()
+        self.invalidate_active_subscription_cache(user_id)
 
         final_subscription_url = updated_panel_user.get("subscriptionUrl")
         final_panel_short_uuid = updated_panel_user.get("shortUuid", panel_short_uuid)
@@ -518,6 +555,7 @@ class SubscriptionService:
             )
             return None
 
+        self.invalidate_active_subscription_cache(user_id)
         final_subscription_url = updated_panel_user.get("subscriptionUrl")
         final_panel_short_uuid = updated_panel_user.get("shortUuid", panel_short_uuid)
 
@@ -608,6 +646,7 @@ class SubscriptionService:
                     f"Panel expiry update failed for {panel_uuid} after {reason} bonus. Local DB was updated to {new_end_date_obj}."
                 )
 
+            self.invalidate_active_subscription_cache(user_id)
             logging.info(
                 f"Subscription for user {user_id} extended by {bonus_days} days ({reason}). New end date: {new_end_date_obj}."
             )
@@ -620,7 +659,22 @@ class SubscriptionService:
 
     async def get_active_subscription_details(
         self, session: AsyncSession, user_id: int
-    ) -> Optional[Dict[str, Any]]:
+    ) -> Optional[ActiveSubscriptionDetails]:
+        now = time.monotonic()
+        cached = self._active_details_cache.get(user_id)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        details = await self._fetch_active_subscription_details(session, user_id)
+        cache = self._active_details_cache
+        if user_id not in cache and len(cache) >= ACTIVE_DETAILS_CACHE_MAX_SIZE:
+            cache.pop(next(iter(cache)))
+        cache[user_id] = (now + ACTIVE_DETAILS_CACHE_TTL_SECONDS, details)
+        return details
+
+    async def _fetch_active_subscription_details(
+        self, session: AsyncSession, user_id: int
+    ) -> Optional[ActiveSubscriptionDetails]:
         db_user = await user_dal.get_user_by_id(session, user_id)
         if not db_user or not db_user.panel_user_uuid:
             logging.info(
@@ -629,10 +683,14 @@ class SubscriptionService:
             return None
 
         panel_user_uuid = db_user.panel_user_uuid
-        local_active_sub = await subscription_dal.get_active_subscription_by_user_id(
-            session, user_id, panel_user_uuid
+        # The panel request does not touch the session, so it can overlap
+        # with the local subscription query.
+        local_active_sub, panel_user_data = await asyncio.gather(
+            subscription_dal.get_active_subscription_by_user_id(
+                session, user_id, panel_user_uuid
+            ),
+            self.panel_service.get_user_by_uuid(panel_user_uuid),
         )
-        panel_user_data = await self.panel_service.get_user_by_uuid(panel_user_uuid)
 
         if not panel_user_data:
             logging.warning(
@@ -701,15 +759,14 @@ class SubscriptionService:
             else None
         )
 
-        return {
-            "end_date": panel_end_date,
-            "status_from_panel": panel_user_data.get("status", "UNKNOWN").upper(),
-            "config_link": panel_user_data.get("subscriptionUrl"),
-            "traffic_limit_bytes": panel_user_data.get("trafficLimitBytes"),
-            "traffic_used_bytes": panel_user_data.get("usedTrafficBytes"),
-            "user_bot_username": db_user.username,
-            "is_panel_data": True,
-        }
+        return ActiveSubscriptionDetails(
+            end_date=panel_end_date,
+            status_from_panel=panel_user_data.get("status", "UNKNOWN").upper(),
+            config_link=panel_user_data.get("subscriptionUrl"),
+            traffic_limit_bytes=panel_user_data.get("trafficLimitBytes"),
+            traffic_used_bytes=panel_user_data.get("usedTrafficBytes"),
+            user_bot_username=db_user.username,
+        )
 
     async def get_subscriptions_ending_soon(
         self, session: AsyncSession, days_threshold: int
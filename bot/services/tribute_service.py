@@ -1,7 +1,9 @@
 import logging
 import hmac
 import hashlib
-import json
+import orjson
+import time
+from collections import OrderedDict
 from typing import Optional
 
 from aiohttp import web
@@ -17,6 +19,11 @@ from .notification_service import notify_admin_new_payment
 from bot.keyboards.inline.user_keyboards import get_connect_and_main_keyboard
 from db.dal import payment_dal, user_dal, subscription_dal
 
+# Tribute retries deliveries it considers failed; an identical body seen within
+# this window is acknowledged without being processed again.
+WEBHOOK_REPLAY_TTL_SECONDS = 3600.0
+WEBHOOK_REPLAY_MAX_ENTRIES = 10000
+
 
 def convert_period_to_months(period: Optional[str]) -> int:
     """Map Tribute subscription period strings to months."""
@@ -51,15 +58,27 @@ class TributeService:
         self.panel_service = panel_service
         self.subscription_service = subscription_service
         self.referral_service = referral_service
+        # sha256 of the raw body -> monotonic expiry time, oldest first
+        self._seen_webhooks: OrderedDict[str, float] = OrderedDict()
+
+    def _claim_webhook(self, digest: str) -> bool:
+        """Mark a webhook body as being handled; False if it was already seen
+        within the replay window."""
+        now = time.monotonic()
+        seen = self._seen_webhooks
+        # Every entry gets the same TTL, so insertion order is expiry order
+        # and only the front ever needs checking.
+        while seen and (next(iter(seen.values())) <= now
+                        or len(seen) >= WEBHOOK_REPLAY_MAX_ENTRIES):
+            seen.popitem(last=False)
+        if digest in seen:
+            return False
+        seen[digest] = now + WEBHOOK_REPLAY_TTL_SECONDS
+        return True
 
     async def handle_webhook(self, raw_body: bytes,
                              signature_header: Optional[str]) -> web.Response:
         settings = self.settings
-        bot = self.bot
-        i18n = self.i18n
-        async_session_factory = self.async_session_factory
-        subscription_service = self.subscription_service
-        referral_service = self.referral_service
 
         if settings.TRIBUTE_API_KEY:
             if not signature_header:
@@ -69,14 +88,36 @@ class TributeService:
             if not hmac.compare_digest(expected_sig, signature_header):
                 return web.Response(status=403, text="invalid_signature")
 
+        digest = hashlib.sha256(raw_body).hexdigest()
+        if not self._claim_webhook(digest):
+            logging.info("Replayed Tribute webhook ignored.")
+            return web.Response(status=200, text="ok_duplicate")
+
+        response = None
         try:
-            payload = json.loads(raw_body.decode())
+            response = await self._process_webhook(raw_body)
+            return response
+        finally:
+            # Let Tribute's retry through if this delivery was not handled.
+            if response is None or response.status != 200:
+                self._seen_webhooks.pop(digest, None)
+
+    async def _process_webhook(self, raw_body: bytes) -> web.Response:
+        settings = self.settings
+        bot = self.bot
+        i18n = self.i18n
+        async_session_factory = self.async_session_factory
+        subscription_service = self.subscription_service
+        referral_service = self.referral_service
+
+        try:
+            payload = orjson.loads(raw_body)
         except Exception:
             return web.Response(status=400, text="bad_request")
 
         logging.info(
             "Tribute webhook data: %s",
-            json.dumps(payload, ensure_ascii=False),
+            orjson.dumps(payload).decode(),
         )
 
         event_name = payload.get('name')
@@ -204,6 +245,9 @@ class TributeService:
 async def tribute_webhook_route(request: web.Request):
     """AIOHTTP route handler for Tribute webhook calls."""
     tribute_service: TributeService = request.app['tribute_service']
-    raw_body = await request.read()
     signature_header = request.headers.get('trbt-signature')
+    if tribute_service.settings.TRIBUTE_API_KEY and not signature_header:
+        # Unsigned requests are rejected before the body is read.
+        return web.Response(status=403, text="no_signature")
+    raw_body = await request.read()
     return await tribute_service.handle_webhook(raw_body, signature_header)
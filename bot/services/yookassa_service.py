@@ -61,7 +61,8 @@ class YooKassaService:
             description: str,
             metadata: Dict[str, Any],
             receipt_email: Optional[str] = None,
-            receipt_phone: Optional[str] = None) -> Optional[Dict[str, Any]]:
+            receipt_phone: Optional[str] = None,
+            idempotence_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
         if not self.configured:
             logging.error("YooKassa is not configured. Cannot create payment.")
             return None
@@ -134,13 +135,16 @@ class YooKassaService:
 
             builder.set_receipt(receipt_data_dict)
 
-            idempotence_key = str(uuid.uuid4())
+            if not idempotence_key:
+                idempotence_key = str(uuid.uuid4())
             payment_request = builder.build()
 
+            # Lazy %-formatting: the metadata and receipt reprs are only built
+            # when INFO records are actually emitted.
             logging.info(
-                f"Creating YooKassa payment (Idempotence-Key: {idempotence_key}). "
-                f"Amount: {amount} {currency}. Metadata: {metadata}. Receipt: {receipt_data_dict}"
-            )
+                "Creating YooKassa payment (Idempotence-Key: %s). "
+                "Amount: %s %s. Metadata: %s. Receipt: %s", idempotence_key,
+                amount, currency, metadata, receipt_data_dict)
 
             loop = asyncio.get_running_loop()
             response = await loop.run_in_executor(
@@ -148,8 +152,8 @@ class YooKassaService:
                                                      idempotence_key))
 
             logging.info(
-                f"YooKassa Payment.create response: ID={response.id}, Status={response.status}, Paid={response.paid}"
-            )
+                "YooKassa Payment.create response: ID=%s, Status=%s, Paid=%s",
+                response.id, response.status, response.paid)
 
             return {
                 "id":
@@ -1,7 +1,16 @@
 import logging
+from dataclasses import dataclass
+from functools import cached_property
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, ValidationError, computed_field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+
+
+@dataclass(slots=True, frozen=True)
+class PricingEntry:
+    rub: float
+    tribute_url: Optional[str]
+    stars: Optional[int]
 
 
 class Settings(BaseSettings):
@@ -16,6 +25,10 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = Field(default="localhost")
     POSTGRES_PORT: int = Field(default=5432)
     POSTGRES_DB: str = Field(default="vpn_shop_db")
+    DB_POOL_SIZE: int = Field(default=10)
+    DB_MAX_OVERFLOW: int = Field(default=20)
+    DB_POOL_RECYCLE_SECONDS: int = Field(default=1800)
+    DB_POOL_TIMEOUT_SECONDS: int = Field(default=30)
 
     DEFAULT_LANGUAGE: str = Field(default="ru")
     DEFAULT_CURRENCY_SYMBOL: str = Field(default="RUB")
@@ -218,8 +231,10 @@ class Settings(BaseSettings):
             return f"{base.rstrip('/')}{self.cryptopay_webhook_path}"
         return None
 
+    # Pricing and bonus tables are derived from env values only, so they are
+    # built once instead of on every attribute access.
     @computed_field
-    @property
+    @cached_property
     def subscription_options(self) -> Dict[int, float]:
         options: Dict[int, float] = {}
 
@@ -233,8 +248,25 @@ class Settings(BaseSettings):
             options[12] = float(self.RUB_PRICE_12_MONTHS)
         return options
 
+    @cached_property
+    def subscription_options_key(self) -> Tuple[Tuple[int, float], ...]:
+        """Hashable form of ``subscription_options`` for keyboard caches."""
+        return tuple(self.subscription_options.items())
+
+    @cached_property
+    def pricing(self) -> Dict[int, PricingEntry]:
+        """All prices and links of an enabled period, looked up once."""
+        tribute_links = self.tribute_payment_links
+        stars_options = self.stars_subscription_options
+        return {
+            months: PricingEntry(rub=price,
+                                 tribute_url=tribute_links.get(months),
+                                 stars=stars_options.get(months))
+            for months, price in self.subscription_options.items()
+        }
+
     @computed_field
-    @property
+    @cached_property
     def stars_subscription_options(self) -> Dict[int, int]:
         options: Dict[int, int] = {}
         if self.STARS_ENABLED and self.MONTH_1_ENABLED and self.STARS_PRICE_1_MONTH is not None:
@@ -248,7 +280,7 @@ class Settings(BaseSettings):
         return options
 
     @computed_field
-    @property
+    @cached_property
     def tribute_payment_links(self) -> Dict[int, str]:
         links: Dict[int, str] = {}
         if self.TRIBUTE_ENABLED and self.MONTH_1_ENABLED and self.TRIBUTE_LINK_1_MONTH:
@@ -262,7 +294,7 @@ class Settings(BaseSettings):
         return links
 
     @computed_field
-    @property
+    @cached_property
     def referral_bonus_inviter(self) -> Dict[int, int]:
         bonuses: Dict[int, int] = {}
         if self.REFERRAL_BONUS_DAYS_INVITER_1_MONTH is not None:
@@ -276,7 +308,7 @@ class Settings(BaseSettings):
         return bonuses
 
     @computed_field
-    @property
+    @cached_property
     def referral_bonus_referee(self) -> Dict[int, int]:
         bonuses: Dict[int, int] = {}
         if self.REFERRAL_BONUS_DAYS_REFEREE_1_MONTH is not None:
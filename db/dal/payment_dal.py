@@ -11,8 +11,9 @@ from db.models import Payment, User
 async def create_payment_record(session: AsyncSession,
                                 payment_data: Dict[str, Any]) -> Payment:
 
-    from .user_dal import get_user_by_id
-    user = await get_user_by_id(session, payment_data["user_id"])
+    # The handlers have usually loaded the payer already (ban check), so the
+    # identity map lookup in session.get() saves a SELECT before the INSERT.
+    user = await session.get(User, payment_data["user_id"])
     if not user:
 
         raise ValueError(
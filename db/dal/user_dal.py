@@ -2,7 +2,7 @@ import logging
 from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 from sqlalchemy import update, delete, func, and_
 from datetime import datetime
 
@@ -15,6 +15,20 @@ async def get_user_by_id(session: AsyncSession, user_id: int) -> Optional[User]:
     return result.scalar_one_or_none()
 
 
+async def get_user_with_inviter(
+    session: AsyncSession, user_id: int
+) -> Tuple[Optional[User], Optional[User]]:
+    inviter_alias = aliased(User)
+    stmt = (
+        select(User, inviter_alias)
+        .outerjoin(inviter_alias, inviter_alias.user_id == User.referred_by_id)
+        .where(User.user_id == user_id)
+    )
+    result = await session.execute(stmt)
+    row = result.one_or_none()
+    return (row[0], row[1]) if row else (None, None)
+
+
 async def get_user_by_username(session: AsyncSession, username: str) -> Optional[User]:
     clean_username = username.lstrip("@").lower()
     stmt = select(User).where(func.lower(User.username) == clean_username)
@@ -1,6 +1,7 @@
 import logging
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from config.settings import Settings
 from .models import Base
@@ -15,9 +16,17 @@ def init_db_connection(settings: Settings) -> sessionmaker:
         logging.info(
             f"Attempting to create SQLAlchemy engine with URL: {settings.DATABASE_URL}"
         )
+        # Keep a queue pool of warm connections (the async engine default,
+        # made explicit) so short DAL calls never pay the connect handshake.
+        # Do not switch to NullPool: every handler opens a session.
         async_engine = create_async_engine(
             settings.DATABASE_URL,
             echo=False,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
             pool_pre_ping=True,
         )
 
@@ -3,6 +3,11 @@ import logging
 import signal
 import sys
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
 from dotenv import load_dotenv
 
 from bot.main_bot import run_bot
@@ -61,6 +66,9 @@ if __name__ == "__main__":
         level=logging.INFO,
         stream=sys.stdout,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logging.info("Using uvloop event loop")
     try:
         asyncio.run(main())
     except (KeyboardInterrupt, SystemExit):